@@ -7,9 +7,9 @@ Author: Eric Joanis
 Copyright (c) 2022, National Research Council Canada
 LICENSE: MIT
 
-Requirements: pip install pympi-ling click
+Requirements: pip install pympi-ling click numpy
 Tested with:
- - pympi-ling==1.69 click==8.0.4 but expected to work with more recent
+ - pympi-ling==1.69 click==8.0.4 numpy==1.24.2 but expected to work with more recent
  - Python from 3.7 to 3.11
 
 Typical usage: python accuracy.py gold.TextGrid candidate.TextGrid
@@ -17,12 +17,16 @@ Typical usage: python accuracy.py gold.TextGrid candidate.TextGrid
 run "python accuracy.py --help" for more usage details.
 """
 
+import codecs
+import math
 import statistics
 import sys
 import unicodedata as ud
+from functools import lru_cache
 from typing import List, Tuple
 
 import click
+import numpy as np
 from pympi.Praat import TextGrid
 
 
@@ -37,8 +41,17 @@ def get_words(textgrid_file: str) -> List[Tuple[float, float, str]]:
 
     Returns: List[Tuple[start: float, end: float, word_text: str]]
     """
+    # Peek at the byte order mark, if any, to try the right codec first instead
+    # of having to parse the whole file and fail with each wrong codec in turn.
+    with open(textgrid_file, "rb") as f:
+        head = f.read(2)
+    if head in (codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE):
+        codecs_to_try: Tuple[str, ...] = ("utf-16", "utf-16-be", "utf-16-le", "utf-8")
+    else:
+        codecs_to_try = ("utf-8", "utf-16", "utf-16-be", "utf-16-le")
+
     textgrid_data = None
-    for codec in "utf-8", "utf-16", "utf-16-be", "utf-16-le":
+    for codec in codecs_to_try:
         try:
             textgrid_data = TextGrid(textgrid_file, codec=codec)
             break
@@ -61,46 +74,77 @@ def get_words(textgrid_file: str) -> List[Tuple[float, float, str]]:
     ]
 
 
+NORMALIZE_TABLE = str.maketrans({"’": "'", ",": None})
+
+
+@lru_cache(maxsize=None)
 def normalize(word):
-    """Normalize the spelling of words to help match between GOLD and CANDIDATE"""
+    """Normalize the spelling of words to help match between GOLD and CANDIDATE
+
+    Results are cached, since the same words come up over and over again.
+    """
     word = word.strip()
     word = ud.normalize("NFC", word)
     word = word.lower()
-    word = word.replace("’", "'")
-    word = word.replace(",", "")
+    word = word.translate(NORMALIZE_TABLE)
     return word
 
 
-def calc_recall(gold_word, cand_word):
-    """Recall is defined as how much of gold_word is within the span of cand_word
+def calc_overlap(gold_times, cand_times):
+    """Return how long each gold word overlaps with its candidate word"""
+    return np.maximum(
+        0,
+        np.minimum(gold_times[:, 1], cand_times[:, 1])
+        - np.maximum(gold_times[:, 0], cand_times[:, 0]),
+    )
+
+
+def calc_recall(gold_times, cand_times):
+    """Recall is defined as how much of each gold word is within the span of
+    its candidate word
 
-    Returns: (recall, numerator, denominator)
+    Args:
+        gold_times, cand_times: arrays of shape (n, 2) of (start, end) times
+
+    Returns: (recall, numerator, denominator), each an array of length n
     """
-    gold_start, gold_end, _ = gold_word
-    cand_start, cand_end, _ = cand_word
-    gold_len = gold_end - gold_start
-    overlap_len = max(0, min(gold_end, cand_end) - max(gold_start, cand_start))
+    gold_len = gold_times[:, 1] - gold_times[:, 0]
+    overlap_len = calc_overlap(gold_times, cand_times)
     return overlap_len / gold_len, overlap_len, gold_len
 
 
-def calc_precision(gold_word, cand_word, prev_gold_word, next_gold_word):
-    """Precision is defined as what proportion of cand_word is inside
-    gold_word, ignoring part of cand_word that are silences just before or
-    after gold_word
+def calc_precision(gold_times, cand_times, following_gold_start=None):
+    """Precision is defined as what proportion of each candidate word is inside
+    its gold word, ignoring part of the candidate word that are silences just
+    before or after the gold word
 
-    Returns: (precision, numerator, denominator)
-    """
-    gold_start, gold_end, _ = gold_word
-    cand_start, cand_end, _ = cand_word
-    prev_gold_end = prev_gold_word[1] if prev_gold_word else 0
-    next_gold_start = next_gold_word[0] if next_gold_word else max(gold_end, cand_end)
+    Args:
+        gold_times, cand_times: arrays of shape (n, 2) of (start, end) times
+        following_gold_start: start time of the gold word following the last
+            one in gold_times, if there is one
 
-    left_error = max(0, prev_gold_end - cand_start)
-    right_error = max(0, cand_end - next_gold_start)
-    overlap_len = max(0, min(gold_end, cand_end) - max(gold_start, cand_start))
+    Returns: (precision, numerator, denominator), each an array of length n
+    """
+    gold_starts, gold_ends = gold_times[:, 0], gold_times[:, 1]
+    cand_starts, cand_ends = cand_times[:, 0], cand_times[:, 1]
+    prev_gold_ends = np.concatenate(([0.0], gold_ends))[:-1]
+    if following_gold_start is None:
+        last_next_gold_start = np.maximum(gold_ends[-1:], cand_ends[-1:])
+    else:
+        last_next_gold_start = [following_gold_start]
+    next_gold_starts = np.concatenate((gold_starts[1:], last_next_gold_start))
+
+    left_error = np.maximum(0, prev_gold_ends - cand_starts)
+    right_error = np.maximum(0, cand_ends - next_gold_starts)
+    overlap_len = calc_overlap(gold_times, cand_times)
 
     denominator = left_error + overlap_len + right_error
-    precision = overlap_len / denominator if overlap_len else 0
+    precision = np.divide(
+        overlap_len,
+        denominator,
+        out=np.zeros_like(overlap_len),
+        where=overlap_len > 0,
+    )
     return precision, overlap_len, denominator
 
 
@@ -112,21 +156,11 @@ def calc_f1(precision, recall):
 
 def histogram(values):
     """Return a 6-tuple: <=0, <=.25, <=.50, <=.75, <1, >=1"""
-    hist = [0] * 6
-    for value in values:
-        if value <= 0:
-            hist[0] += 1
-        elif value <= 0.25:
-            hist[1] += 1
-        elif value <= 0.50:
-            hist[2] += 1
-        elif value <= 0.75:
-            hist[3] += 1
-        elif value < 1.0:
-            hist[4] += 1
-        else:
-            hist[5] += 1
-    return hist
+    values = np.asarray(values, dtype=float)
+    # Bin index: number of upper bounds in (0, .25, .50, .75) strictly below
+    # each value, plus one more for the values >= 1
+    bins = np.searchsorted([0, 0.25, 0.50, 0.75], values) + (values >= 1.0)
+    return np.bincount(bins, minlength=6).tolist()
 
 
 def describe_values(values, title):
@@ -136,11 +170,12 @@ def describe_values(values, title):
     count = len(values)
     print(
         "histogram (<=0, <=.25, <=.50, <=.75, <1, ==1):",
-        ", ".join(str(n) for n in hist),
+        ", ".join([str(n) for n in hist]),
     )
     print("histogram in fractions:", ", ".join([f"{n/count:.4f}" for n in hist]))
-    average = sum(values) / count
-    print(f"sum: {sum(values):.2f} count: {count} avg: {average:.4f}")
+    total = math.fsum(values)
+    average = total / count
+    print(f"sum: {total:.2f} count: {count} avg: {average:.4f}")
     print()
     return average
 
@@ -186,7 +221,8 @@ def main(
     shift_ms: float,
 ):
     """Calculate the accuracy of CANDIDATE alignments against the GOLD standard."""
-    sys.stdout.reconfigure(encoding="utf-8")  # type: ignore
+    # Block buffering even on a terminal: we only write a report, no progress info
+    sys.stdout.reconfigure(encoding="utf-8", line_buffering=False)  # type: ignore
 
     threshold_list = thresholds.split(",")
     threshold_seconds = [int(t) / 1000 for t in threshold_list]
@@ -206,60 +242,59 @@ def main(
     if shift_ms != 0.0:
         shift_times(candidate_words, shift_ms)
 
+    # The word-by-word report can be long: collect it and write it out at once
+    report = []
     word_mismatch_count = 0
-    matches = [0] * len(threshold_list)
-
-    def add_matches(gold_pos, cand_pos):
-        for i, t in enumerate(threshold_seconds):
-            if abs(cand_pos - gold_pos) < t:
-                matches[i] += 1
-
-    recall_list = []  # for averaged R, F1
-    recall_num_total, recall_denom_total = 0, 0  # for accumulated R, F1
-    precision_list = []  # for averaged R,P,F1
-    precision_num_total, precision_denom_total = 0, 0  # for accumulated P, F1
-
-    ext_gold = [None, *gold_words, None]
-    for prev_g, g, next_g, c in zip(
-        ext_gold, gold_words, ext_gold[2:], candidate_words
-    ):
+    for g, c in zip(gold_words, candidate_words):
         if normalize(g[2]) != normalize(c[2]):
             word_mismatch_count += 1
-            print(g, c, " ----  MISMATCHED WORD")
+            report.append(f"{g} {c}  ----  MISMATCHED WORD\n")
         else:
             if debug:
-                print(g, c)
-        add_matches(g[0], c[0])
-        add_matches(g[1], c[1])
-        recall, numerator, denom = calc_recall(g, c)
-        recall_list.append(recall)
-        recall_num_total += numerator
-        recall_denom_total += denom
-        precision, numerator, denom = calc_precision(g, c, prev_g, next_g)
-        precision_list.append(precision)
-        precision_num_total += numerator
-        precision_denom_total += denom
-        # print(g, c, f"r={recall:.4f} p={precision:.4f}")
+                report.append(f"{g} {c}\n")
 
     delta_words = len(gold_words) - len(candidate_words)
     if delta_words > 0:
         for g in gold_words[len(candidate_words) :]:
-            print(g, " ----  EXTRA GOLD WORD")
-        print(f"Gold has {delta_words} more word(s) than Candidate.")
+            report.append(f"{g}  ----  EXTRA GOLD WORD\n")
+        report.append(f"Gold has {delta_words} more word(s) than Candidate.\n")
     if delta_words < 0:
         for c in candidate_words[len(gold_words) :]:
-            print("\t\t\t\t", c, " ----  EXTRA CANDIDATE WORD")
-        print(f"Candidate has {-delta_words} more word(s) than Gold.")
+            report.append(f"\t\t\t\t {c}  ----  EXTRA CANDIDATE WORD\n")
+        report.append(f"Candidate has {-delta_words} more word(s) than Gold.\n")
+    sys.stdout.write("".join(report))
     print("Word count:", len(gold_words))
     print("Word mismatches:", word_mismatch_count)
 
-    # Accuracy calculations for word boundaries
+    # All the scores below are calculated over the (start, end) times of the
+    # pairs of GOLD and CANDIDATE words at the same position
+    pair_count = min(len(gold_words), len(candidate_words))
+    gold_times = np.array([w[:2] for w in gold_words[:pair_count]]).reshape(-1, 2)
+    cand_times = np.array([w[:2] for w in candidate_words[:pair_count]]).reshape(-1, 2)
+
+    # Accuracy calculations for word boundaries: count, for each threshold, how
+    # many start and end times in CANDIDATE are within that threshold of GOLD
+    boundary_errors = np.abs(cand_times - gold_times).ravel()
+    matches = (
+        (boundary_errors < np.array(threshold_seconds)[:, np.newaxis])
+        .sum(axis=1)
+        .tolist()
+    )
     denominator = 2 * len(gold_words)
     scores = [num / denominator for num in matches]
     print(" &\t".join(f"<{t}" for t in threshold_list))
     print(" &\t".join(f"{score:.2f}" for score in scores))
     print()
 
+    recall, recall_num, recall_denom = calc_recall(gold_times, cand_times)
+    precision, precision_num, precision_denom = calc_precision(
+        gold_times,
+        cand_times,
+        gold_words[pair_count][0] if pair_count < len(gold_words) else None,
+    )
+    recall_list = recall.tolist()  # for averaged R, F1
+    precision_list = precision.tolist()  # for averaged R,P,F1
+
     # P/R/F1 distributions for whole words
     avg_precision = describe_values(precision_list, "Precision")
     avg_recall = describe_values(recall_list, "Recall")
@@ -270,8 +305,8 @@ def main(
     )
 
     # Accumulated P/R/F1 for whole words
-    acc_precision = precision_num_total / precision_denom_total
-    acc_recall = recall_num_total / recall_denom_total
+    acc_precision = precision_num.sum() / precision_denom.sum()
+    acc_recall = recall_num.sum() / recall_denom.sum()
     print(
         f"Accumulated p={acc_precision:.4f} r={acc_recall:.4f} F1={calc_f1(acc_precision, acc_recall):.4f}"
     )
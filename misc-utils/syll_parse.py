@@ -61,6 +61,7 @@
 
 import argparse
 import unicodedata
+from functools import lru_cache
 
 from lxml import etree
 
@@ -71,19 +72,63 @@ from lxml import etree
 """This program syllabifies words based on the Sonority Sequencing Principle (SSP)"""
 
 
+# SONORITY HIERARCHY, MODIFY FOR LANGUAGE BELOW
+# categories can be collapsed into more general groups
+VOWELS = "aeiouyèùòìà"
+SONORITY_CLASSES = (
+    (VOWELS, 5),
+    ("", 4),  # approximates
+    ("lmnrw", 3),  # resonants and nasals
+    ("zvsf", 2),  # fricatives
+    ("", 1),  # affricates
+    ("bcdgtkpqxhj", 0),  # stops: rest of consonants
+)
+# Sonority score of each letter, in both cases, so sonoripy() needs only one
+# dict lookup per letter; anything not listed counts as a stop.
+SONORITY = {
+    char: score
+    for letters, score in SONORITY_CLASSES
+    for char in letters + letters.upper()
+}
+VOWEL_LETTERS = frozenset(VOWELS + VOWELS.upper())
+# Punctuation to strip from the ends of a word before syllabifying it
+STRIP_CHARS = ".:;?!)('\""
+
+# SYLLABIFICATION RULES: what to do with a letter in the middle of a word,
+# keyed on how its sonority compares with the preceding and following
+# phonemes' (1: greater, 0: equal, -1: less)
+SSP_ACTIONS = {
+    # these cases DO NOT trigger syllable breaks
+    (1, -1): "append",
+    (-1, 1): "append",
+    (1, 1): "append",
+    (0, 1): "append",
+    (1, 0): "append",
+    (0, -1): "append",
+    # these cases DO trigger syllable break
+    (0, 0): "break_after",  # equal to preceding AND following
+    (-1, -1): "break_before",  # less than preceding AND following (trough)
+    (-1, 0): "break_after",  # less than preceding AND equal to following
+}
+
+
+# Real texts repeat the same words over and over, so cache the results;
+# they are returned as tuples so the cached values cannot be modified.
+@lru_cache(maxsize=None)
 def sonoripy(word):  # noqa: C901
     def no_syll_no_vowel(ss):
         # no syllable if no vowel
+        # ss is a list of (syllable, has_vowel) pairs
         nss = []
         front = ""
-        for i, syll in enumerate(ss):
+        for syll, has_vowel in ss:
             # if following syllable doesn't have vowel,
             # add it to the current one
-            if not any(char.lower() in vowels for char in syll):
+            if not has_vowel:
                 if len(nss) == 0:
                     front += syll
                 else:
-                    nss = nss[:-1] + [nss[-1] + syll]
+                    nss[-1] += syll
             else:
                 if len(nss) == 0:
                     nss.append(front + syll)
@@ -92,133 +137,57 @@ def sonoripy(word):  # noqa: C901
 
         return nss
 
-    # SONORITY HIERARCHY, MODIFY FOR LANGUAGE BELOW
-    # categories can be collapsed into more general groups
-    vowels = "aeiouyèùòìà"
-    approximates = ""
-    nasals = "lmnrw"  # resonants and nasals
-    fricatives = "zvsf"
-    affricates = ""
-    stops = "bcdgtkpqxhj"  # rest of consonants
-
     vowelcount = 0  # if vowel count is 1, syllable is automatically 1
     sylset = []  # to collect letters and corresponding values
-    for letter in word.strip(".:;?!)('" + '"'):
-        if letter.lower() in vowels:
-            sylset.append((letter, 5))
+    for letter in word.strip(STRIP_CHARS):
+        score = SONORITY.get(letter, 0)
+        sylset.append((letter, score))
+        if letter in VOWEL_LETTERS:
             vowelcount += 1  # to check for monosyllabic words
-        elif letter.lower() in approximates:
-            sylset.append((letter, 4))
-        elif letter.lower() in nasals:
-            sylset.append((letter, 3))
-        elif letter.lower() in fricatives:
-            sylset.append((letter, 2))
-        elif letter.lower() in affricates:
-            sylset.append((letter, 1))
-        elif letter.lower() in stops:
-            sylset.append((letter, 0))
-        else:
-            sylset.append((letter, 0))
 
     # below actually divides the syllables
     newsylset = []
     if vowelcount <= 1:  # finalize word immediately if monosyllabic
         newsylset.append(word)
     else:
-        syllable = ""  # prepare empty syllable to build upon
-        for i, tup in enumerate(sylset):
+        syllable = []  # prepare empty syllable to build upon, letter by letter
+        has_vowel = False  # whether syllable contains a vowel so far
+        for i, (letter, score) in enumerate(sylset):
             if i == 0:  # if it's the first letter, append automatically
-                syllable += tup[0]
-            # lengths below are in order to not overshoot index
-            # when it looks beyond
+                syllable.append(letter)
+                has_vowel = letter in VOWEL_LETTERS
+            # add whatever is left at end of word, last letter
+            elif i == len(sylset) - 1:
+                syllable.append(letter)
+                newsylset.append(
+                    ("".join(syllable), has_vowel or letter in VOWEL_LETTERS)
+                )
             else:
-                # add whatever is left at end of word, last letter
-                if i == len(sylset) - 1:
-                    syllable += tup[0]
-                    newsylset.append(syllable)
-
-                # MAIN ALGORITHM BELOW
-                # these cases DO NOT trigger syllable breaks
-                elif (
-                    (i < len(sylset) - 1)
-                    and tup[1] < sylset[i + 1][1]
-                    and tup[1] > sylset[i - 1][1]
-                ):
-                    syllable += tup[0]
-                elif (
-                    (i < len(sylset) - 1)
-                    and tup[1] > sylset[i + 1][1]
-                    and tup[1] < sylset[i - 1][1]
-                ):
-                    syllable += tup[0]
-                elif (
-                    (i < len(sylset) - 1)
-                    and tup[1] > sylset[i + 1][1]
-                    and tup[1] > sylset[i - 1][1]
-                ):
-                    syllable += tup[0]
-                elif (
-                    (i < len(sylset) - 1)
-                    and tup[1] > sylset[i + 1][1]
-                    and tup[1] == sylset[i - 1][1]
-                ):
-                    syllable += tup[0]
-                elif (
-                    (i < len(sylset) - 1)
-                    and tup[1] == sylset[i + 1][1]
-                    and tup[1] > sylset[i - 1][1]
-                ):
-                    syllable += tup[0]
-                elif (
-                    (i < len(sylset) - 1)
-                    and tup[1] < sylset[i + 1][1]
-                    and tup[1] == sylset[i - 1][1]
-                ):
-                    syllable += tup[0]
-
-                # these cases DO trigger syllable break
-                # if phoneme value is equal to value of preceding AND following
-                # phoneme
-                elif (
-                    (i < len(sylset) - 1)
-                    and tup[1] == sylset[i + 1][1]
-                    and tup[1] == sylset[i - 1][1]
-                ):
-                    syllable += tup[0]
-                    # append and break syllable BEFORE appending letter at
-                    # index in new syllable
-                    newsylset.append(syllable)
-                    syllable = ""
-
-                # if phoneme value is less than preceding AND following value
-                # (trough)
-                elif (
-                    (i < len(sylset) - 1)
-                    and tup[1] < sylset[i + 1][1]
-                    and tup[1] < sylset[i - 1][1]
-                ):
-                    # append and break syllable BEFORE appending letter at
-                    # index in new syllable
-                    newsylset.append(syllable)
-                    syllable = ""
-                    syllable += tup[0]
-
-                # if phoneme value is less than preceding value AND equal to
-                # following value
-                elif (
-                    (i < len(sylset) - 1)
-                    and tup[1] == sylset[i + 1][1]
-                    and tup[1] < sylset[i - 1][1]
-                ):
-                    syllable += tup[0]
+                # MAIN ALGORITHM: compare with the preceding and following
+                # phonemes and look up what to do in SSP_ACTIONS
+                prev_score = sylset[i - 1][1]
+                next_score = sylset[i + 1][1]
+                action = SSP_ACTIONS[
+                    (score > prev_score) - (score < prev_score),
+                    (score > next_score) - (score < next_score),
+                ]
+                if action == "break_before":
                     # append and break syllable BEFORE appending letter at
                     # index in new syllable
-                    newsylset.append(syllable)
-                    syllable = ""
+                    newsylset.append(("".join(syllable), has_vowel))
+                    syllable = [letter]
+                    has_vowel = letter in VOWEL_LETTERS
+                else:
+                    syllable.append(letter)
+                    has_vowel = has_vowel or letter in VOWEL_LETTERS
+                    if action == "break_after":
+                        newsylset.append(("".join(syllable), has_vowel))
+                        syllable = []
+                        has_vowel = False
 
         newsylset = no_syll_no_vowel(newsylset)
 
-    return newsylset
+    return tuple(newsylset)
 
 
 ### Modifications by Fineen Davis at National Research Council Canada
@@ -230,7 +199,7 @@ parser = argparse.ArgumentParser(
 )
 parser.add_argument(
     "input_file",
-    type=argparse.FileType("r"),
+    type=argparse.FileType("rb"),
     help="Input tokenized XML file to syllabify (use - for stdin)",
 )
 parser.add_argument(
@@ -242,23 +211,21 @@ parser.add_argument(
 )
 args = parser.parse_args()
 
-# Load XML file and read it
-equiv_text = unicodedata.normalize("NFC", args.input_file.read())
-
-# root = etree.fromstring(equiv_text)
-root = etree.fromstring(equiv_text.encode("UTF-8"))
+# Load XML file: let lxml parse it straight from the file, instead of holding
+# a decoded and a re-encoded copy of the whole document in memory
+tree = etree.parse(args.input_file)
+root = tree.getroot()
 
 
-# Find <w> elements in XML file
-for word in root.findall(".//w"):
-    if "id" in word.attrib:
-        del word.attrib["id"]
-    # get the text for each word
-    word_text = word.text
+# Find <w> elements in XML file (in a list, since we add new <w> elements as we go)
+for word in list(root.iterdescendants("w")):
+    word.attrib.pop("id", None)
+    # get the text for each word, NFC normalized
+    word_text = unicodedata.normalize("NFC", word.text or "")
     # remove text from word element
     word.text = ""
 
-    word_sylls = sonoripy(word_text)  # word_sylls is a list of lists []
+    word_sylls = sonoripy(word_text)  # word_sylls is a tuple of strings
 
     # Adds sylls to <syll> elements which are children of the <w> element
     # for syll in word_sylls:
@@ -268,14 +235,13 @@ for word in root.findall(".//w"):
 
     # Adds sylls as <w> elements for alignment purposes
     prev_word = word
-    prev_word.text = word_sylls.pop(0)
+    prev_word.text = word_sylls[0]
 
-    for syll in word_sylls:
+    for syll in word_sylls[1:]:
         next_word = etree.Element("w")
         next_word.text = syll
         prev_word.addnext(next_word)
         prev_word = next_word
 
 
-tree = etree.ElementTree(root)
 tree.write(args.output_file, pretty_print=True)
@@ -1,14 +1,25 @@
 """Main readalongs module for aligning text and audio."""
 
-import copy
 import io
 import os
 import shutil
 import sys
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
+import numpy as np
 import soundswallower
 from pydub import AudioSegment
 from pydub.exceptions import CouldntEncodeError
@@ -27,16 +38,15 @@ from readalongs.audio_utils import (
     write_audio_to_file,
 )
 from readalongs.dna_utils import (
-    calculate_adjustment,
-    correct_adjustments,
+    calculate_adjustments,
+    correct_all_adjustments,
     dna_union,
-    segment_intersection,
     sort_and_join_dna_segments,
 )
 from readalongs.log import LOGGER
 from readalongs.portable_tempfile import PortableNamedTemporaryFile
-from readalongs.text.make_dict import make_dict
-from readalongs.text.make_fsg import make_fsg
+from readalongs.text.make_dict import make_dict_list, make_dict_text
+from readalongs.text.make_fsg import make_fsg_name, make_fsg_text, make_fsg_transitions
 from readalongs.text.make_package import (
     DEFAULT_HEADER,
     DEFAULT_SUBHEADER,
@@ -44,6 +54,7 @@ from readalongs.text.make_package import (
     create_web_component_html,
 )
 from readalongs.text.util import (
+    compiled_xpath,
     parse_time,
     save_minimal_index_html,
     save_readme_txt,
@@ -90,7 +101,7 @@ def get_sequences(
     start = None
     words = []
     all_good = True
-    for e in xml.xpath(f".//{unit} | .//{anchor}"):
+    for e in xml.iterdescendants(unit, anchor):
         if e.tag == unit:
             words.append(e)
         else:
@@ -138,31 +149,50 @@ def split_silences(words: List[dict], final_end, excluded_segments: List[dict])
         excluded_segments: list of segments to exclude, having ["begin"] and ["end"]
             times in milliseconds
     """
-    last_end = 0.0
-    last_word: dict = {}
-    words.append({"id": "dummy", "start": final_end, "end": final_end})
-    for word in words:
-        start = word["start"]
-        if start > last_end:
-            gap = start - last_end
-            midpoint = round(last_end + gap / 2, 3)
-            excluded_within_gap = segment_intersection(
-                [{"begin": last_end * 1000, "end": start * 1000}], excluded_segments
-            )
-            if not excluded_within_gap:
-                # Base case, there were no excluded segments between last_word and word
-                if last_word:
-                    last_word["end"] = midpoint
-                word["start"] = midpoint
-            else:
-                if last_word:
-                    last_word["end"] = min(
-                        midpoint, excluded_within_gap[0]["begin"] / 1000
-                    )
-                word["start"] = max(midpoint, excluded_within_gap[-1]["end"] / 1000)
-        last_word = word
-        last_end = word["end"]
-    _ = words.pop()
+    # The gap after the last word, up to final_end, is treated like the gap
+    # before a zero-length word at final_end
+    word_count = len(words)
+    starts = np.array([word["start"] for word in words] + [final_end], dtype=float)
+    ends = np.array([word["end"] for word in words] + [final_end], dtype=float)
+    last_ends = np.concatenate(([0.0], ends[:-1]))
+    gaps = starts - last_ends
+    midpoints = (last_ends + gaps / 2).tolist()
+
+    # For each gap, find the first and last excluded segments intersecting it,
+    # if any: excluded_segments are sorted and don't overlap, so both their
+    # begin and end times are in ascending order.
+    excluded_begins = np.array([seg["begin"] for seg in excluded_segments], dtype=float)
+    excluded_ends = np.array([seg["end"] for seg in excluded_segments], dtype=float)
+    gap_begins_ms = last_ends * 1000
+    gap_ends_ms = starts * 1000
+    first_excluded = np.searchsorted(excluded_ends, gap_begins_ms, side="left")
+    last_excluded = np.searchsorted(excluded_begins, gap_ends_ms, side="right") - 1
+    has_excluded = (first_excluded <= last_excluded).tolist()
+    if excluded_segments:
+        # Where the gap contains excluded segments, the silence split has to
+        # stop at the first one's begin time and resume at the last one's end time
+        excluded_begin_in_gap = np.maximum(
+            gap_begins_ms,
+            excluded_begins[np.minimum(first_excluded, len(excluded_segments) - 1)],
+        ).tolist()
+        excluded_end_in_gap = np.minimum(
+            gap_ends_ms, excluded_ends[np.maximum(last_excluded, 0)]
+        ).tolist()
+
+    for i in np.flatnonzero(gaps > 0).tolist():
+        midpoint = round(midpoints[i], 3)
+        if not has_excluded[i]:
+            # Base case, there were no excluded segments between the previous word
+            # and this one
+            if i > 0:
+                words[i - 1]["end"] = midpoint
+            if i < word_count:
+                words[i]["start"] = midpoint
+        else:
+            if i > 0:
+                words[i - 1]["end"] = min(midpoint, excluded_begin_in_gap[i] / 1000)
+            if i < word_count:
+                words[i]["start"] = max(midpoint, excluded_end_in_gap[i] / 1000)
 
 
 def create_asr_config(
@@ -237,42 +267,48 @@ def create_asr_config(
     return asr_config
 
 
-def read_noisedict(asr_config: soundswallower.Config) -> Set[str]:
+def read_noisedict(asr_config: soundswallower.Config) -> FrozenSet[str]:
     """Read the list of noise words from the acoustic model.
 
     Args:
         asr_config (soundswallower.Config): ASR configuration.
     Returns:
-        Set[str]: Set of noise words from noisedict, or a default set
+        FrozenSet[str]: Set of noise words from noisedict, or a default set
             if it could not be found.
     """
-
-    def load_noisedict(fdict):
-        try:
-            with open(fdict, "rt", encoding="utf-8") as dictfh:
-                noisewords = set()
-                for line in dictfh:
-                    if line.startswith("##") or line.startswith(";;"):
-                        continue
-                    noisewords.add(line.strip().split()[0])
-                return noisewords
-        except FileNotFoundError:
-            return None
-
     fdict: str = asr_config["fdict"]  # type: ignore
     acoustic_model: str = asr_config["hmm"]  # type: ignore
-    noisewords = None
+    candidates = [
+        os.path.join(acoustic_model, "noisedict.txt"),
+        os.path.join(acoustic_model, "noisedict"),
+    ]
     if fdict is not None:  # pragma: no cover
-        noisewords = load_noisedict(fdict)
-    if noisewords is None:
-        noisewords = load_noisedict(os.path.join(acoustic_model, "noisedict.txt"))
-    if noisewords is None:  # pragma: no cover
-        noisewords = load_noisedict(os.path.join(acoustic_model, "noisedict"))
-    if noisewords is None:  # pragma: no cover
-        LOGGER.warning("Could not find noisedict, using defaults")
-        noisewords = {"<sil>", "<s>", "</s>", "[NOISE]"}
+        candidates.insert(0, fdict)
+    for path in candidates:
+        try:
+            stat = os.stat(path)
+            return load_noisedict(path, stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            pass
+
+    LOGGER.warning("Could not find noisedict, using defaults")  # pragma: no cover
+    return frozenset({"<sil>", "<s>", "</s>", "[NOISE]"})  # pragma: no cover
+
+
+@lru_cache(maxsize=8)
+def load_noisedict(path: str, mtime_ns: int, size: int) -> FrozenSet[str]:
+    """Read the noise words from the noisedict file at path.
 
-    return noisewords
+    The results are cached, and mtime_ns and size are part of the cache key so
+    that a noisedict file is read again when it changes.
+    """
+    with open(path, "rt", encoding="utf-8") as dictfh:
+        noisewords = set()
+        for line in dictfh:
+            if line.startswith("##") or line.startswith(";;"):
+                continue
+            noisewords.add(line.strip().split()[0])
+    return frozenset(noisewords)
 
 
 def process_dna(
@@ -331,121 +367,337 @@ def process_dna(
     return processed_audio, dna_segments, removed_segments
 
 
-def align_sequence(
+def prepare_sequence(
     audio_data: AudioSegment,
     word_sequence: WordSequence,
-    asr_config: soundswallower.Config,
     xml_path: str,
     i: int,
     unit: Optional[str] = "w",
     save_temps: Optional[str] = None,
-) -> AudioSegment:
-    """Run alignment for a word sequence.
+) -> Tuple[List[Tuple[str, str]], List[Tuple[int, int, float, str]], AudioSegment]:
+    """Prepare the inputs to the aligner for a word sequence.
 
     Args:
         audio_data (AudioSegment): Full input audio.
         word_sequence (WordSequence): Sequence of units to align.
-        asr_config (soundswallower.Config): Aligner configuration.
-        unit (str): Name of unit we are aligning.
         xml_path (str): Path to input XML file.
         i (int): Index of this sequence in the full file.
-
+        unit (str): Name of unit we are aligning.
         save_temps (str): Optional; Prefix for saving temporary files,
             or None to not save them.
 
     Returns:
-        Iterable[soundswallower.Seg]: Word (or other unit) alignments.
-
-    Raises:
-        RuntimeError: If alignment fails (TODO: figure out why).
+        (dict_entries, fsg_transitions, audio_segment): the dictionary entries
+        and FSG transitions for the words in the sequence, and the part of the
+        audio they should be aligned to.
     """
     i_suffix = "" if i == 0 else "." + str(i + 1)
 
-    # Generate dictionary and FSG for the current sequence of words
-    dict_data = make_dict(word_sequence.words, xml_path, unit=unit)
+    # Generate the dictionary entries for the current sequence of words
+    dict_entries = make_dict_list(word_sequence.words, xml_path, unit=unit)
     if save_temps is not None:
-        dict_file = io.open(save_temps + ".dict" + i_suffix, "wb")
-    else:
-        dict_file = PortableNamedTemporaryFile(prefix="readalongs_dict_", delete=True)
-    dict_file.write(dict_data.encode("utf-8"))
-    dict_file.close()
+        with io.open(save_temps + ".dict" + i_suffix, "wb") as dict_file:
+            dict_file.write(make_dict_text(dict_entries).encode("utf-8"))
 
-    fsg_data = make_fsg(word_sequence.words, xml_path)
+    # Generate the FSG for the current sequence of words
+    fsg_transitions = make_fsg_transitions(word_sequence.words)
     if save_temps is not None:
-        fsg_file = io.open(save_temps + ".fsg" + i_suffix, "wb")
-    else:
-        fsg_file = PortableNamedTemporaryFile(prefix="readalongs_fsg_", delete=True)
-    fsg_file.write(fsg_data.encode("utf-8"))
-    fsg_file.close()
+        with io.open(save_temps + ".fsg" + i_suffix, "wb") as fsg_file:
+            fsg_file.write(make_fsg_text(fsg_transitions, xml_path).encode("utf-8"))
 
     # Extract the part of the audio corresponding to this word sequence
     audio_segment = extract_section(audio_data, word_sequence.start, word_sequence.end)
     if save_temps is not None and audio_segment is not audio_data:
         write_audio_to_file(audio_segment, save_temps + ".wav" + i_suffix)
 
-    # Configure soundswallower for this sequence's dict and fsg
-    asr_config["dict"] = dict_file.name
-    asr_config["fsg"] = fsg_file.name
+    return dict_entries, fsg_transitions, audio_segment
+
+
+def create_decoder(
+    asr_config: soundswallower.Config, dict_entries: List[Tuple[str, str]]
+) -> soundswallower.Decoder:
+    """Create an aligner whose dictionary starts with dict_entries.
+
+    The dictionary must be given explicitly, otherwise soundswallower loads the
+    acoustic model's own dictionary, if it has one, and any word id that is
+    also a word in that dictionary would get aligned with the wrong phones.
+
+    Args:
+        asr_config (soundswallower.Config): Aligner configuration.
+        dict_entries (List[Tuple[str, str]]): Dictionary entries to start with,
+            typically those of the first sequence to align; must not be empty.
+
+    Returns:
+        soundswallower.Decoder: the new aligner
+    """
+    with PortableNamedTemporaryFile(
+        prefix="readalongs_dict_", delete=True
+    ) as dict_file:
+        dict_file.write(make_dict_text(dict_entries).encode("utf-8"))
+        dict_file.close()
+        asr_config["dict"] = dict_file.name
+        return soundswallower.Decoder(asr_config)
+
+
+def decode_sequence(
+    decoder: soundswallower.Decoder,
+    dict_entries: List[Tuple[str, str]],
+    fsg_name: str,
+    fsg_transitions: List[Tuple[int, int, float, str]],
+    raw_data: bytes,
+) -> Iterable[soundswallower.Seg]:
+    """Run the aligner on a word sequence prepared by prepare_sequence().
+
+    Args:
+        decoder (soundswallower.Decoder): Aligner, reused across sequences; the
+            words of this sequence get added to its dictionary if they are not
+            already in it.
+        dict_entries (List[Tuple[str, str]]): Dictionary entries for the words.
+        fsg_name (str): Name to give the FSG.
+        fsg_transitions (List[Tuple[int, int, float, str]]): FSG for the words.
+        raw_data (bytes): Raw audio data to align the words to.
+
+    Returns:
+        Iterable[soundswallower.Seg]: Word (or other unit) alignments.
+
+    Raises:
+        RuntimeError: If a word cannot be added to the decoder's dictionary.
+    """
+    # Add the words of the current sequence to the decoder's dictionary, unless
+    # create_decoder() already put them there
+    for word_id, phones in dict_entries:
+        if decoder.lookup_word(word_id) == phones:
+            continue
+        try:
+            # No need to update the search now, set_fsg() below will do it
+            decoder.add_word(word_id, phones, update=False)
+        except KeyError as e:
+            # soundswallower raises KeyError for clashing ids and invalid phones
+            raise RuntimeError(
+                f"Could not add word {word_id} with phones '{phones}' to the "
+                f"aligner's dictionary: {e}"
+            ) from e
+
+    # Configure soundswallower for this sequence's fsg, built directly in memory
+    fsg = decoder.create_fsg(
+        fsg_name,
+        start_state=0,
+        final_state=len(fsg_transitions),
+        transitions=fsg_transitions,
+    )
+    decoder.set_fsg(fsg)
 
-    ps = soundswallower.Decoder(asr_config)
     # Align this word sequence
-    ps.start_utt()
-    ps.process_raw(audio_segment.raw_data, no_search=False, full_utt=True)
-    ps.end_utt()
+    decoder.start_utt()
+    decoder.process_raw(raw_data, no_search=False, full_utt=True)
+    decoder.end_utt()
 
-    return ps.seg
+    return decoder.seg
 
 
 def process_segmentation(
     segmentation: Iterable[soundswallower.Seg],
     curr_removed_segments: List[dict],
-    noisewords: Set[str],
+    noisewords: FrozenSet[str],
     frame_size: float,
     debug_aligner: Optional[bool] = False,
 ) -> List[Dict[str, Any]]:
     """Correct output alignments based on do-not-align segments."""
-    aligned_words: List[Dict[str, Any]] = []
-    for word_seg in segmentation:
-        if word_seg.text in noisewords:
-            continue
-        start = word_seg.start
-        end = word_seg.start + word_seg.duration
-        # round to milliseconds to avoid imprecisions
-        start_ms = round(start * 1000)
-        end_ms = round(end * 1000)
-        # possibly adjust for removed sections
-        if curr_removed_segments:
-            start_ms += calculate_adjustment(start_ms, curr_removed_segments)
-            end_ms += calculate_adjustment(end_ms, curr_removed_segments)
-            start_ms, end_ms = correct_adjustments(
-                start_ms, end_ms, curr_removed_segments
+    word_segs = [seg for seg in segmentation if seg.text not in noisewords]
+    if not word_segs:
+        return []
+    # round to milliseconds to avoid imprecisions
+    starts_ms = np.array([round(seg.start * 1000) for seg in word_segs])
+    ends_ms = np.array([round((seg.start + seg.duration) * 1000) for seg in word_segs])
+    # possibly adjust for removed sections
+    if curr_removed_segments:
+        starts_ms = starts_ms + calculate_adjustments(starts_ms, curr_removed_segments)
+        ends_ms = ends_ms + calculate_adjustments(ends_ms, curr_removed_segments)
+        starts_ms, ends_ms = correct_all_adjustments(
+            starts_ms, ends_ms, curr_removed_segments
+        )
+    assert np.all(starts_ms[1:] >= ends_ms[:-1])
+    # change back to seconds
+    aligned_words: List[Dict[str, Any]] = [
+        {"id": seg.text, "start": start, "end": end}
+        for seg, start, end in zip(
+            word_segs, (starts_ms / 1000).tolist(), (ends_ms / 1000).tolist()
+        )
+    ]
+    if debug_aligner:
+        for word in aligned_words:
+            LOGGER.info(
+                "Segment: %s (%.3f : %.3f)", word["id"], word["start"], word["end"]
             )
-        # change back to seconds
-        start = start_ms / 1000
-        end = end_ms / 1000
-        if aligned_words:
-            assert start >= aligned_words[-1]["end"]
-        aligned_words.append({"id": word_seg.text, "start": start, "end": end})
-        if debug_aligner:
-            LOGGER.info("Segment: %s (%.3f : %.3f)", word_seg.text, start, end)
     return aligned_words
 
 
+def align_sequence_modes(
+    get_decoder: Callable[[int, List[Tuple[str, str]]], soundswallower.Decoder],
+    mode_count: int,
+    dict_entries: List[Tuple[str, str]],
+    fsg_name: str,
+    fsg_transitions: List[Tuple[int, int, float, str]],
+    raw_data: bytes,
+    word_count: int,
+    curr_removed_segments: List[dict],
+    noisewords: FrozenSet[str],
+    frame_size: float,
+    debug_aligner: Optional[bool] = False,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Align a prepared word sequence with each alignment mode in turn, until
+    one of them aligns all the words in the sequence.
+
+    Args:
+        get_decoder (Callable[[int, List[Tuple[str, str]]], soundswallower.Decoder]):
+            function returning the decoder to use for the j'th alignment mode,
+            creating it with the given dictionary entries if needed
+        mode_count (int): number of alignment modes to try
+        word_count (int): number of words in the sequence
+        The other arguments are passed on to decode_sequence() and
+        process_segmentation().
+
+    Returns:
+        (aligned_words, modes_tried): the aligned words produced by the last
+        alignment mode tried, and the number of modes tried.
+    """
+    for j in range(mode_count):
+        segmentation = decode_sequence(
+            get_decoder(j, dict_entries),
+            dict_entries,
+            fsg_name,
+            fsg_transitions,
+            raw_data,
+        )
+        # Process raw segmentation, adjusting alignments for DNA
+        aligned_words = process_segmentation(
+            segmentation=segmentation,
+            curr_removed_segments=curr_removed_segments,
+            noisewords=noisewords,
+            frame_size=frame_size,
+            debug_aligner=debug_aligner,
+        )
+        if len(aligned_words) == word_count:
+            break
+    return aligned_words, j + 1
+
+
+# Per-process state of the worker processes used by align_audio() when jobs > 1
+_align_worker_state: Dict[str, Any] = {}
+
+
+def _init_align_worker(
+    asr_config_jsons: List[str], noisewords: FrozenSet[str], frame_size: float
+):
+    """Initialize an alignment worker process"""
+    _align_worker_state["asr_config_jsons"] = asr_config_jsons
+    _align_worker_state["noisewords"] = noisewords
+    _align_worker_state["frame_size"] = frame_size
+    _align_worker_state["decoders"] = {}
+
+
+def _get_align_worker_decoder(
+    j: int, dict_entries: List[Tuple[str, str]]
+) -> soundswallower.Decoder:
+    """Return this worker's decoder for the j'th alignment mode, creating it if needed"""
+    decoders = _align_worker_state["decoders"]
+    if j not in decoders:
+        decoders[j] = create_decoder(
+            soundswallower.Config.parse_json(
+                _align_worker_state["asr_config_jsons"][j]
+            ),
+            dict_entries,
+        )
+    return decoders[j]
+
+
+def _align_sequence_in_worker(args: tuple) -> Tuple[List[Dict[str, Any]], int]:
+    """Run align_sequence_modes() in a worker process"""
+    return align_sequence_modes(
+        _get_align_worker_decoder,
+        len(_align_worker_state["asr_config_jsons"]),
+        *args,
+        noisewords=_align_worker_state["noisewords"],
+        frame_size=_align_worker_state["frame_size"],
+    )
+
+
+def align_sequences(
+    all_sequence_args: Iterable[tuple],
+    asr_configs: List[soundswallower.Config],
+    noisewords: FrozenSet[str],
+    frame_size: float,
+    debug_aligner: Optional[bool] = False,
+    jobs: int = 1,
+) -> Iterable[Tuple[List[Dict[str, Any]], int]]:
+    """Run align_sequence_modes() on each sequence, in order.
+
+    Args:
+        all_sequence_args (Iterable[tuple]): the positional arguments to
+            align_sequence_modes() that are specific to each sequence
+        asr_configs (List[soundswallower.Config]): the configurations for
+            each alignment mode to try
+        jobs (int): number of worker processes to use; with 1, the sequences
+            are aligned lazily in this process as the results are iterated over
+        The other arguments are passed on to align_sequence_modes().
+
+    Returns:
+        Iterable[Tuple[List[Dict[str, Any]], int]]: the results of
+        align_sequence_modes() for each sequence
+    """
+    if jobs > 1:
+        # Each worker process loads its own decoders, and aligns whole sequences
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_align_worker,
+            initargs=([c.dumps() for c in asr_configs], noisewords, frame_size),
+        ) as executor:
+            return list(executor.map(_align_sequence_in_worker, all_sequence_args))
+
+    # Loading the acoustic model is expensive, so each decoder is created only
+    # when its alignment mode is first needed, and then reused for all sequences
+    decoders: Dict[int, soundswallower.Decoder] = {}
+
+    def get_decoder(
+        j: int, dict_entries: List[Tuple[str, str]]
+    ) -> soundswallower.Decoder:
+        if j not in decoders:
+            decoders[j] = create_decoder(asr_configs[j], dict_entries)
+        return decoders[j]
+
+    return (
+        align_sequence_modes(
+            get_decoder,
+            len(asr_configs),
+            *sequence_args,
+            noisewords=noisewords,
+            frame_size=frame_size,
+            debug_aligner=debug_aligner,
+        )
+        for sequence_args in all_sequence_args
+    )
+
+
 def insert_silence(
     results: Dict[str, Any],
     audio: AudioSegment,
     xml_path: Optional[str] = "XML Input",
+    words_by_id: Optional[Dict[str, dict]] = None,
 ):
-    """Insert the required silences in the audio stream."""
-    words_dict = {
-        x["id"]: {"start": x["start"], "end": x["end"]} for x in results["words"]
-    }
-    silence_offsets: defaultdict = defaultdict(int)
-    silence = 0
-    if results["tokenized"].xpath("//silence"):
-        endpoint = 0
+    """Insert the required silences in the audio stream.
+
+    words_by_id, if given, must map the id of each word in results["words"] to
+    that word, as index_words() does.
+    """
+    if words_by_id is None:
+        words_by_id = index_words(results["words"])
+    silence = 0  # total silence inserted so far, in ms
+    # (position in the original audio, duration) in ms of each silence to insert
+    insertions: List[Tuple[float, int]] = []
+    if next(results["tokenized"].iter("silence"), None) is not None:
+        insertion_point = 0
         all_good = True
-        for el in results["tokenized"].xpath("//*"):
+        for el in results["tokenized"].iter("silence", "w"):
             if el.tag == "silence" and "dur" in el.attrib:
                 try:
                     silence_ms = parse_time(el.attrib["dur"])
@@ -456,47 +708,88 @@ def insert_silence(
                     )
                     all_good = False
                     continue
-                silence_segment = AudioSegment.silent(
-                    duration=silence_ms
-                )  # create silence segment
                 silence += silence_ms  # add silence length to total silence
-                audio = (
-                    audio[:endpoint] + silence_segment + audio[endpoint:]
-                )  # insert silence at previous endpoint
-                endpoint += silence_ms  # add silence to previous endpoint
+                insertions.append((insertion_point, silence_ms))
             if el.tag == "w":
-                silence_offsets[el.attrib["id"]] += (
-                    silence / 1000
-                )  # add silence in seconds to silence offset for word id
-                endpoint = (
-                    words_dict[el.attrib["id"]]["end"] * 1000
-                ) + silence  # bump endpoint and include silence
+                word = words_by_id.get(el.attrib["id"])
+                if word is None:  # It may not be aligned
+                    continue
+                # silences go after the last word seen
+                insertion_point = word["end"] * 1000
+                if silence:
+                    # shift the word by the silence inserted before it, in seconds
+                    word["start"] += silence / 1000
+                    word["end"] += silence / 1000
         if not all_good:
             raise RuntimeError(
                 f"Could not parse all duration attributes in silence elements in {xml_path}, please make sure each silence "
                 'element is properly formatted, e.g., <silence dur="1.5s"/>.  Aborting.'
             )
     if silence:
-        for word in results["words"]:
-            word["start"] += silence_offsets[word["id"]]
-            word["end"] += silence_offsets[word["id"]]
-        results["audio"] = audio
+        results["audio"] = splice_silences(audio, insertions)
+
+
+def splice_silences(
+    audio: AudioSegment, insertions: List[Tuple[float, int]]
+) -> AudioSegment:
+    """Return audio with silences inserted at the given points.
+
+    The audio data is copied only once, where inserting each silence in turn
+    with AudioSegment slicing and concatenation would copy it for each one.
+
+    Args:
+        audio (AudioSegment): the original audio
+        insertions (List[Tuple[float, int]]): (position, duration) in ms of each
+            silence to insert, with positions in increasing order and relative
+            to the original audio
+
+    Returns:
+        AudioSegment: the audio with the silences
+    """
+    data = memoryview(audio.raw_data)
+    frame_width = audio.frame_width
+    frame_count = len(data) // frame_width
+    chunks: List[Union[bytes, memoryview]] = []
+    prev_frame = 0
+    for position_ms, silence_ms in insertions:
+        frame = min(int(audio.frame_count(ms=position_ms)), frame_count)
+        frame = max(frame, prev_frame)
+        chunks.append(data[prev_frame * frame_width : frame * frame_width])
+        chunks.append(bytes(int(audio.frame_count(ms=silence_ms)) * frame_width))
+        prev_frame = frame
+    chunks.append(data[prev_frame * frame_width :])
+    return AudioSegment(
+        data=b"".join(chunks),
+        sample_width=audio.sample_width,
+        frame_rate=audio.frame_rate,
+        channels=audio.channels,
+    )
+
+
+def index_words(words: List[dict]) -> Dict[str, dict]:
+    """Return a dict mapping the id of each word in words to the word itself"""
+    return {word["id"]: word for word in words}
 
 
 def add_alignments(
     results: Dict[str, Any],
+    words_by_id: Optional[Dict[str, dict]] = None,
 ):
-    """Add the computed alignments to the XML tags."""
-    # Round all times to three digits, as noted below
-    words_dict = {
-        x["id"]: (("%.3f" % x["start"]), ("%.3f" % (x["end"] - x["start"])))
-        for x in results["words"]
-    }
+    """Add the computed alignments to the XML tags.
+
+    words_by_id, if given, must map the id of each word in results["words"] to
+    that word, as index_words() does.
+    """
+    if words_by_id is None:
+        words_by_id = index_words(results["words"])
     # FIXME: Should propagate durations to higher-level elements, ideally
-    for el in results["tokenized"].xpath("//w"):
+    for el in results["tokenized"].iter("w"):
+        word = words_by_id.get(el.attrib["id"])
         # It may not be aligned
-        if el.attrib["id"] in words_dict:
-            el.attrib["time"], el.attrib["dur"] = words_dict[el.attrib["id"]]
+        if word is not None:
+            # Round all times to three digits
+            el.attrib["time"] = "%.3f" % word["start"]
+            el.attrib["dur"] = "%.3f" % (word["end"] - word["start"])
 
 
 def align_audio(
@@ -511,6 +804,8 @@ def align_audio(
     debug_aligner: Optional[bool] = False,
     output_orthography: str = "eng-arpabet",
     alignment_mode: str = "auto",
+    jobs: int = 1,
+    use_g2p_cache: bool = False,
 ):
     """Align an XML input file to an audio file.
 
@@ -528,6 +823,10 @@ def align_audio(
             iff True
         debug_aligner (boolean): Optional, output debugging info from the aligner.
         alignment_mode (str): Optional, controls the decoder beam width
+        jobs (int): Optional, number of processes aligning anchor-separated
+            sequences in parallel; ignored with save_temps or debug_aligner
+        use_g2p_cache (boolean): Optional, reuse the tokenized and g2p'd XML
+            from a previous call on the same input in this process
 
     Returns:
         Dict[str, Any]: TODO
@@ -539,12 +838,15 @@ def align_audio(
     if config is None:
         config = {}
 
+    # Note: on a cache hit, the g2p warnings logged by the first call on this
+    # input are not logged again.
     xml = parse_and_make_xml(
         xml_path=xml_path,
         config=config,
         verbose_g2p_warnings=verbose_g2p_warnings,
         save_temps=save_temps,
         output_orthography=output_orthography,
+        use_cache=use_g2p_cache,
     )
     results["tokenized"] = xml
 
@@ -586,46 +888,65 @@ def align_audio(
     # soundswallower, which are indexes in frames, into durations in seconds.
     frame_size = 1.0 / asr_config["frate"]  # type: ignore
 
-    # Get list of words to ignore in aligner output
+    # Get list of words to ignore in aligner output, read once for all sequences
     noisewords = read_noisedict(asr_config)
 
     # Extract the list of sequences of words in the XML
     word_sequences = get_sequences(xml, xml_path, unit=unit)
-    final_end = 0.0
-    for i, word_sequence in enumerate(word_sequences):
-        for j, cur_asr_config in enumerate(asr_configs):
-            # Run the aligner on this sequence
-            segmentation = align_sequence(
-                audio_data=audio_data,
-                word_sequence=word_sequence,
-                asr_config=cur_asr_config,
-                xml_path=xml_path,
-                i=i,
-                unit=unit,
-                save_temps=save_temps,
-            )
+    fsg_name = make_fsg_name(xml_path)
+
+    def sequence_args(i: int, word_sequence: WordSequence) -> tuple:
+        """Positional arguments to align_sequence_modes() for word_sequence"""
+        dict_entries, fsg_transitions, audio_segment = prepare_sequence(
+            audio_data=audio_data,
+            word_sequence=word_sequence,
+            xml_path=xml_path,
+            i=i,
+            unit=unit,
+            save_temps=save_temps,
+        )
+        # List of removed segments for the sequence we are currently processing
+        curr_removed_segments = dna_union(
+            word_sequence.start,
+            word_sequence.end,
+            audio_length_in_ms,
+            removed_segments,
+        )
+        return (
+            dict_entries,
+            fsg_name,
+            fsg_transitions,
+            audio_segment.raw_data,
+            len(word_sequence.words),
+            curr_removed_segments,
+        )
 
-            # List of removed segments for the sequence we are currently processing
-            curr_removed_segments = dna_union(
-                word_sequence.start,
-                word_sequence.end,
-                audio_length_in_ms,
-                removed_segments,
-            )
-            # Process raw segmentation, adjusting alignments for DNA
-            aligned_words = process_segmentation(
-                segmentation=segmentation,
-                curr_removed_segments=curr_removed_segments,
-                noisewords=noisewords,
-                frame_size=frame_size,
-                debug_aligner=debug_aligner,
-            )
+    # The aligner logs would get mixed up if several processes wrote them,
+    # so only parallelize when they are not requested.
+    if save_temps is not None or debug_aligner:
+        jobs = 1
+    outcomes = align_sequences(
+        (sequence_args(i, seq) for i, seq in enumerate(word_sequences)),
+        asr_configs=asr_configs,
+        noisewords=noisewords,
+        frame_size=frame_size,
+        debug_aligner=debug_aligner,
+        jobs=min(jobs, len(word_sequences)),
+    )
 
-            if len(aligned_words) != len(word_sequence.words):
-                LOGGER.warning(f"Align mode {align_modes[j]} failed for sequence {i}.")
+    final_end = 0.0
+    for i, (word_sequence, (aligned_words, modes_tried)) in enumerate(
+        zip(word_sequences, outcomes)
+    ):
+        for j in range(modes_tried):
+            if len(aligned_words) != len(word_sequence.words) or j < modes_tried - 1:
+                LOGGER.warning(
+                    "Align mode %s failed for sequence %d.", align_modes[j], i
+                )
             else:
-                LOGGER.info(f"Align mode {align_modes[j]} succeeded for sequence {i}.")
-                break
+                LOGGER.info(
+                    "Align mode %s succeeded for sequence %d.", align_modes[j], i
+                )
 
         results["words"].extend(aligned_words)
         if aligned_words:
@@ -639,9 +960,9 @@ def align_audio(
             )
 
     aligned_segment_count = len(results["words"])
-    token_count = len(results["tokenized"].xpath(f"//{unit}"))
-    LOGGER.info(f"Number of words found: {token_count}")
-    LOGGER.info(f"Number of aligned segments: {aligned_segment_count}")
+    token_count = len(compiled_xpath(f"//{unit}")(results["tokenized"]))
+    LOGGER.info("Number of words found: %d", token_count)
+    LOGGER.info("Number of aligned segments: %d", aligned_segment_count)
 
     if aligned_segment_count == 0:
         raise RuntimeError(
@@ -659,7 +980,9 @@ def align_audio(
     if not bare:
         # Take all the boundaries (anchors) around segments and add them as DNA
         # segments for the purpose of splitting silences
-        dna_for_silence_splitting = copy.deepcopy(dna_segments)
+        # (sort_and_join_dna_segments() copies the segments it modifies, so
+        # a shallow copy of the list is enough here)
+        dna_for_silence_splitting = list(dna_segments)
         last_end = None
         for seq in word_sequences:
             if last_end or seq.start:
@@ -674,16 +997,21 @@ def align_audio(
         )
         split_silences(results["words"], final_end, dna_for_silence_splitting)
 
+    # Both steps below look up words by id, so index them just once
+    words_by_id = index_words(results["words"])
+
     # Insert silences if requested
     insert_silence(
         results=results,
         audio=audio,
         xml_path=xml_path,
+        words_by_id=words_by_id,
     )
 
     # Add alignments to word tags
     add_alignments(
         results=results,
+        words_by_id=words_by_id,
     )
 
     return results
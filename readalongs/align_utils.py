@@ -2,11 +2,14 @@
 Functions for saving alignments in various file formats.
 """
 
+import copy
+import hashlib
 import io
+from collections import OrderedDict
 from datetime import timedelta
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from xml.sax.saxutils import escape
 
-import chevron
 from lxml import etree
 from pympi.Praat import TextGrid
 from webvtt import Caption, WebVTT
@@ -14,10 +17,17 @@ from webvtt import Caption, WebVTT
 from readalongs._version import READALONG_FILE_FORMAT_VERSION, VERSION
 from readalongs.portable_tempfile import PortableNamedTemporaryFile
 from readalongs.text.add_elements_to_xml import add_images, add_supplementary_xml
-from readalongs.text.add_ids_to_xml import add_ids
-from readalongs.text.convert_xml import convert_xml
+from readalongs.text.add_ids_to_xml import add_ids_in_place
+from readalongs.text.convert_xml import convert_words
 from readalongs.text.tokenize_xml import tokenize_xml
-from readalongs.text.util import get_word_text, load_xml, save_xml
+from readalongs.text.util import compiled_xpath, get_word_text, load_xml, save_xml
+
+# Aligning the same text against several recordings (e.g., retakes) from a
+# long-lived process runs the exact same tokenization and g2p each time, so
+# parse_and_make_xml(use_cache=True) keeps the results for the most recent
+# inputs, keyed on a digest of the XML and the g2p output orthography.
+G2P_CACHE_SIZE = 8
+_g2p_cache: "OrderedDict[Tuple[bytes, str], etree.ElementTree]" = OrderedDict()
 
 
 def parse_and_make_xml(
@@ -26,6 +36,7 @@ def parse_and_make_xml(
     save_temps: Optional[str] = None,
     verbose_g2p_warnings: Optional[bool] = False,
     output_orthography: str = "eng-arpabet",
+    use_cache: bool = False,
 ) -> etree.ElementTree:
     """Parse XML input and run tokenization and G2P.
 
@@ -35,6 +46,10 @@ def parse_and_make_xml(
         save_temps (str): Optional; Save temporary files, by default None
         verbose_g2p_warnings (boolean): Optional; display all g2p errors and warnings
             iff True
+        output_orthography (str): Optional; orthography to g2p the words into
+        use_cache (boolean): Optional; reuse the results of a previous call on
+            the same input in this process, without logging its g2p warnings
+            again. Ignored with save_temps or verbose_g2p_warnings.
 
     Returns:
         lxml.etree.ElementTree: Parsed and prepared XML
@@ -52,13 +67,27 @@ def parse_and_make_xml(
         xml = add_images(xml, config)
     if "xml" in config:
         xml = add_supplementary_xml(xml, config)
+
+    # The cache is bypassed when we need to save the intermediate files or
+    # to display all the g2p warnings again.
+    use_cache = use_cache and save_temps is None and not verbose_g2p_warnings
+    if use_cache:
+        cache_key = (
+            hashlib.blake2b(etree.tostring(xml), digest_size=16).digest(),
+            output_orthography,
+        )
+        if cache_key in _g2p_cache:
+            _g2p_cache.move_to_end(cache_key)
+            return copy.deepcopy(_g2p_cache[cache_key])
+
+    # tokenize_xml() returns a copy, so the following steps can work in place
     xml = tokenize_xml(xml)
     if save_temps is not None:
         save_xml(save_temps + ".tokenized.readalong", xml)
-    xml = add_ids(xml)
+    xml = add_ids_in_place(xml)
     if save_temps is not None:
         save_xml(save_temps + ".ids.readalong", xml)
-    xml, valid = convert_xml(
+    xml, valid = convert_words(
         xml,
         verbose_warnings=verbose_g2p_warnings,
         output_orthography=output_orthography,
@@ -70,6 +99,10 @@ def parse_and_make_xml(
             "Some words could not be g2p'd correctly. Aborting. "
             "Run with --debug-g2p for more detailed g2p error logs."
         )
+    if use_cache:
+        _g2p_cache[cache_key] = copy.deepcopy(xml)
+        if len(_g2p_cache) > G2P_CACHE_SIZE:
+            _g2p_cache.popitem(last=False)
     return xml
 
 
@@ -136,7 +169,7 @@ def save_subtitles(
 
 def get_word_element(xml: etree.ElementTree, el_id: str) -> etree.ElementTree:
     """Get the xml etree for a given word by its id"""
-    return xml.xpath(f'//w[@id="{el_id}"]')[0]
+    return compiled_xpath("//w[@id=$el_id]")(xml, el_id=el_id)[0]
 
 
 def get_ancestor_sent_el(word_el: etree.ElementTree) -> Union[None, etree.ElementTree]:
@@ -166,11 +199,18 @@ def get_word_texts_and_sentences(
     sent_words: List[Dict[str, Any]] = []
     all_words: List[Dict[str, Any]] = []
     prev_sent_el = None
+    # Index the words once, instead of searching the whole XML for each word
+    word_els: Dict[str, etree.ElementTree] = {}
+    for word_el in tokenized_xml.iter("w"):
+        word_els.setdefault(word_el.get("id"), word_el)
     for word in words:
         # The sentence is considered the set of words under the same <s> element.
         # A word that's not under any <s> element is bad input, but we consider
         # it a sentence by itself for software robustness.
-        word_el = get_word_element(tokenized_xml, word["id"])
+        try:
+            word_el = word_els[word["id"]]
+        except KeyError as e:
+            raise IndexError(f'No <w> element has id "{word["id"]}"') from e
         sent_el = get_ancestor_sent_el(word_el)
         if prev_sent_el is None or sent_el is not prev_sent_el:
             if sent_words:
@@ -277,12 +317,9 @@ def convert_to_xhtml(tokenized_xml, title="Book"):
         del tokenized_xml.attrib["version"]
     tokenized_xml.tag = "html"
     tokenized_xml.attrib["xmlns"] = "http://www.w3.org/1999/xhtml"
-    for elem in tokenized_xml.iter():
-        spans = {"u", "s", "m", "w"}
-        if elem.tag == "s":
-            elem.tag = "p"
-        elif elem.tag in spans:
-            elem.tag = "span"
+    # Let lxml only visit the elements we rename, skipping all the others in C
+    for elem in tokenized_xml.iter("s", "u", "m", "w"):
+        elem.tag = "p" if elem.tag == "s" else "span"
     # Wrap everything in a <body> element
     body = etree.Element("body")
     for elem in tokenized_xml:
@@ -301,34 +338,29 @@ def convert_to_xhtml(tokenized_xml, title="Book"):
 
 
 # TODO: add this <!-- DO NOT USE THIS DATA WITHOUT EXPLICIT PERMISSION --> to template
-RAS_TEMPLATE = """<?xml version='1.0' encoding='utf-8'?>
-<read-along version="{{format_version}}">
-    <meta name="generator" content="@readalongs/studio (cli) {{studio_version}}" />
-    <text xml:lang="{{main_lang}}" fallback-langs="{{fallback_langs}}">
+RAS_HEADER_TEMPLATE = """<?xml version='1.0' encoding='utf-8'?>
+<read-along version="{format_version}">
+    <meta name="generator" content="@readalongs/studio (cli) {studio_version}" />
+    <text xml:lang="{main_lang}" fallback-langs="{fallback_langs}">
         <body>
-        {{#pages}}
-            <div type="page">
-            {{#paragraphs}}
-                <p>
-                {{#sentences}}
-                    <s>{{.}}</s>
-                {{/sentences}}
-                </p>
-            {{/paragraphs}}
-            </div>
-        {{/pages}}
-        </body>
+"""
+RAS_FOOTER = """        </body>
     </text>
 </read-along>
 """
 
 
+def xml_escape(text: str) -> str:
+    """Escape &, <, > and " in text to insert it in XML text or attribute values"""
+    return escape(text, {'"': "&quot;"})
+
+
 def create_ras_from_text(lines: Iterable[str], text_languages: Sequence[str]) -> str:
     """Create input xml in ReadAlong XML format (see static/read-along-1.2.dtd)
         Uses the line sequence to infer paragraph and sentence structure from plain text:
         Assumes a double blank line marks a page break, and a single blank line
         marks a paragraph break.
-        Creates the XML using chevron
+        Creates the XML as a list of lines joined once at the end
 
     Args:
         lines: lines from the input plain text, e.g., f.readlines() on file handle f
@@ -338,37 +370,45 @@ def create_ras_from_text(lines: Iterable[str], text_languages: Sequence[str]) ->
         str: Formatted XML, ready to print
     """
     assert text_languages, "The text_languages list may not be empty."
-    kwargs = {
-        "main_lang": text_languages[0],
-        "fallback_langs": ",".join(text_languages[1:]),
-        "studio_version": VERSION,
-        "format_version": READALONG_FILE_FORMAT_VERSION,
-    }
-    pages: List[dict] = []
-    paragraphs: List[dict] = []
-    sentences: List[str] = []
+    output = [
+        RAS_HEADER_TEMPLATE.format(
+            main_lang=xml_escape(text_languages[0]),
+            fallback_langs=xml_escape(",".join(text_languages[1:])),
+            studio_version=xml_escape(VERSION),
+            format_version=xml_escape(READALONG_FILE_FORMAT_VERSION),
+        )
+    ]
+    # Output the XML in a single pass over the lines, opening pages and
+    # paragraphs as sentences come in and closing them on blank lines.
+    in_page = in_paragraph = False
     for line in lines:
         stripped_line = line.strip()
         if stripped_line == "":
-            if not sentences:
+            if in_paragraph:
+                # end the paragraph, a new one begins with the next sentence
+                output.append("                </p>\n")
+                in_paragraph = False
+            elif in_page:
                 # The previous line was also blank, so this is a page break
                 # (but don't insert empty pages)
-                if paragraphs:
-                    pages.append({"paragraphs": paragraphs})
-                paragraphs = []
-            else:
-                # add sentences and begin new paragraph
-                paragraphs.append({"sentences": sentences})
-                sentences = []
+                output.append("            </div>\n")
+                in_page = False
         else:
             # Add text to sentence
-            sentences.append(stripped_line)
-    # Add the last paragraph/sentence
-    if sentences:
-        paragraphs.append({"sentences": sentences})
-    if paragraphs:
-        pages.append({"paragraphs": paragraphs})
-    return chevron.render(RAS_TEMPLATE, {**kwargs, **{"pages": pages}})
+            if not in_page:
+                output.append('            <div type="page">\n')
+                in_page = True
+            if not in_paragraph:
+                output.append("                <p>\n")
+                in_paragraph = True
+            output.append(f"                    <s>{xml_escape(stripped_line)}</s>\n")
+    # Close the last paragraph/page
+    if in_paragraph:
+        output.append("                </p>\n")
+    if in_page:
+        output.append("            </div>\n")
+    output.append(RAS_FOOTER)
+    return "".join(output)
 
 
 def create_input_ras(**kwargs):
@@ -376,7 +416,7 @@ def create_input_ras(**kwargs):
         Uses readlines to infer paragraph and sentence structure from plain text.
         Assumes a double blank line marks a page break, and a single blank line
         marks a paragraph break.
-        Outputs to uft-8 XML using chevron.
+        Outputs to uft-8 XML.
 
     Args:
         **kwargs: dict containing these arguments:
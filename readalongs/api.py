@@ -88,6 +88,9 @@ def align(
         language: Specify only if textfile is plain text;
             list of languages for g2p and g2p cascade
         save_temps (bool): Optional; whether to save temporary files
+        use_g2p_cache (bool): Optional; reuse the g2p results of an earlier call
+            on the same text in this process; the log of such a call then does
+            not repeat the g2p warnings
 
         Run "readalongs align -h" or consult
         https://readalong-studio.readthedocs.io/en/latest/cli-ref.html#readalongs-align
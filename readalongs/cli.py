@@ -65,6 +65,23 @@ def get_click_file_name(click_file):
     return "-" if name == "<stdin>" else name
 
 
+def check_output_file(output_path, force_overwrite):
+    """Raise a click.BadParameter unless output_path can be written to
+
+    Args:
+        output_path(str): the output file we are about to write
+        force_overwrite(bool): whether existing files may be overwritten
+
+    Raises:
+        click.BadParameter: if output_path already exists and force_overwrite is False
+    """
+    # lexists() does not follow symlinks, so a dangling symlink also counts
+    if not force_overwrite and os.path.lexists(output_path):
+        raise click.BadParameter(
+            "Output file %s exists already, use -f to overwrite." % output_path
+        )
+
+
 CONTEXT_SETTINGS = dict(help_option_names=["-h", "--help"])
 
 
@@ -181,6 +198,16 @@ def cli():
     hidden=True,
     help="Hidden option to change the output orthography",
 )
+@click.option(
+    "--use-g2p-cache",
+    is_flag=True,
+    default=False,
+    hidden=True,
+    help=(
+        "Hidden option for long-lived callers of api.align(): reuse the g2p "
+        "results of an earlier call on the same text, without its g2p warnings"
+    ),
+)
 @click.option(
     "-l",
     "--language",
@@ -208,6 +235,16 @@ def cli():
     ),
     default="auto",
 )
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    help=(
+        "Number of processes to use to align the sequences between anchors "
+        "in parallel (default: 1)"
+    ),
+)
 @click.option(
     "-s",
     "--save-temps",
@@ -395,6 +432,8 @@ def align(**kwargs):  # noqa: C901  # some versions of flake8 need this here ins
             debug_aligner=kwargs["debug_aligner"],
             output_orthography=kwargs["output_orth"],
             alignment_mode=kwargs["align_mode"],
+            jobs=kwargs["jobs"],
+            use_g2p_cache=kwargs["use_g2p_cache"],
         )
     except RuntimeError as e:
         raise click.UsageError(e) from e
@@ -549,10 +588,7 @@ def make_xml(**kwargs):
         else:
             if not str(out_file).endswith(".readalong"):
                 out_file += ".readalong"
-            if os.path.exists(out_file) and not kwargs["force_overwrite"]:
-                raise click.BadParameter(
-                    "Output file %s exists already, use -f to overwrite." % out_file
-                )
+            check_output_file(out_file, kwargs["force_overwrite"])
 
             _, filename = create_input_ras(
                 input_file_handle=input_file,
@@ -615,10 +651,7 @@ def tokenize(**kwargs):
         if ext != ".readalong" and output_path != "-":
             output_path += ".readalong"
 
-    if os.path.exists(output_path) and not kwargs["force_overwrite"]:
-        raise click.BadParameter(
-            "Output file %s exists already, use -f to overwrite." % output_path
-        )
+    check_output_file(output_path, kwargs["force_overwrite"])
 
     try:
         xml = load_xml(input_file)
@@ -702,8 +735,8 @@ def g2p(**kwargs):
     from lxml import etree
 
     from readalongs.log import LOGGER
-    from readalongs.text.add_ids_to_xml import add_ids
-    from readalongs.text.convert_xml import convert_xml
+    from readalongs.text.add_ids_to_xml import add_ids_in_place
+    from readalongs.text.convert_xml import convert_words
     from readalongs.text.util import load_xml, save_xml, write_xml
 
     if kwargs["debug"]:
@@ -732,10 +765,7 @@ def g2p(**kwargs):
         if ext != ".readalong" and output_path != "-":
             output_path += ".readalong"
 
-    if os.path.exists(output_path) and not kwargs["force_overwrite"]:
-        raise click.BadParameter(
-            "Output file %s exists already, use -f to overwrite." % output_path
-        )
+    check_output_file(output_path, kwargs["force_overwrite"])
 
     try:
         xml = load_xml(input_file)
@@ -746,10 +776,11 @@ def g2p(**kwargs):
         )
 
     # Add the IDs to paragraph, sentences, word, etc.
-    xml = add_ids(xml)
+    # (xml was just loaded, so there is no need to copy it at each step)
+    xml = add_ids_in_place(xml)
 
     # Apply the g2p mappings.
-    xml, valid = convert_xml(xml, verbose_warnings=kwargs["debug_g2p"])
+    xml, valid = convert_words(xml, verbose_warnings=kwargs["debug_g2p"])
 
     if output_path == "-":
         write_xml(sys.stdout.buffer, xml)
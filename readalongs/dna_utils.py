@@ -6,9 +6,10 @@ The items in the list represent time-ranges in the audio that should not be alig
 any units in the text.
 """
 
-import copy
 from typing import List, Tuple
 
+import numpy as np
+
 
 def sort_and_join_dna_segments(do_not_align_segments: List[dict]) -> List[dict]:
     """Give a list of DNA segments, sort them and join any overlapping ones"""
@@ -17,7 +18,7 @@ def sort_and_join_dna_segments(do_not_align_segments: List[dict]) -> List[dict]:
         if results and results[-1]["end"] >= seg["begin"]:
             results[-1]["end"] = max(results[-1]["end"], seg["end"])
         else:
-            results.append(copy.deepcopy(seg))
+            results.append(dict(seg))
     return results
 
 
@@ -57,6 +58,64 @@ def calculate_adjustment(timestamp: int, do_not_align_segments: List[dict]) -> i
     return results
 
 
+def calculate_adjustments(
+    timestamps: np.ndarray, do_not_align_segments: List[dict]
+) -> np.ndarray:
+    """Vectorized calculate_adjustment(): return the adjustment for each timestamp
+
+    Args:
+        timestamps (np.ndarray): times in ms
+        do_not_align_segments (List[dict]): DNA segments, sorted in ascending order
+            of their "begin" and not overlapping
+
+    Returns:
+        np.ndarray: the sum (ms) of the lengths of the do-not-align segments
+        that start before each timestamp, as calculate_adjustment() defines it
+    """
+    begins = np.array([seg["begin"] for seg in do_not_align_segments])
+    ends = np.array([seg["end"] for seg in do_not_align_segments])
+    assert np.all(begins[1:] > ends[:-1]) and np.all(begins[:1] > -1)
+    # The adjustments accumulated before each segment, and after the last one
+    cumulative = np.concatenate(([0], np.cumsum(ends - begins)))
+    # calculate_adjustment() counts segment i if its begin is at most the
+    # timestamp shifted by the segments before it, i.e., if
+    # begins[i] - cumulative[i] <= timestamp. Those thresholds are increasing,
+    # so the segments counted are the ones before a binary search point.
+    return cumulative[
+        np.searchsorted(begins - cumulative[:-1], timestamps, side="right")
+    ]
+
+
+def correct_all_adjustments(
+    starts: np.ndarray, ends: np.ndarray, do_not_align_segments: List[dict]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized correct_adjustments(): correct each (start, end) pair
+
+    Args:
+        starts, ends (np.ndarray): the start and end of each segment (in ms)
+        do_not_align_segments (List[dict]): DNA segments, sorted in ascending order
+            of their "begin" and not overlapping
+
+    Returns:
+        (np.ndarray, np.ndarray): corrected starts and ends
+    """
+    dna_begins = np.array([seg["begin"] for seg in do_not_align_segments])
+    dna_ends = np.array([seg["end"] for seg in do_not_align_segments])
+    # The first DNA segment starting after each start is the only candidate:
+    # all later ones also end later, so if it doesn't end before the
+    # corresponding end, none of them do.
+    i = np.searchsorted(dna_begins, starts, side="right")
+    inside = i < len(dna_begins)
+    i = np.minimum(i, len(dna_begins) - 1)
+    seg_begins, seg_ends = dna_begins[i], dna_ends[i]
+    inside &= ends > seg_ends
+    keep_start = seg_begins - starts > ends - seg_ends
+    return (
+        np.where(inside & ~keep_start, seg_ends, starts),
+        np.where(inside & keep_start, seg_begins, ends),
+    )
+
+
 def segment_intersection(segments1: List[dict], segments2: List[dict]) -> List[dict]:
     """Return the intersection of two lists of segments
 
@@ -18,7 +18,7 @@ from copy import deepcopy
 
 from lxml import etree
 
-from readalongs.text.util import is_do_not_align
+from readalongs.text.util import compiled_xpath, is_do_not_align
 
 TAG_TO_ID = {
     "text": "t",
@@ -57,7 +57,7 @@ def add_ids_aux(element: etree, ids: defaultdict, parent_id: str = "") -> defaul
                 'Found <w> element with do-not-align="true" attribute. '
                 "This is not allowed, please verify you XML input."
             )
-        if element.xpath(".//w"):
+        if compiled_xpath(".//w")(element):
             raise RuntimeError(
                 'Found <w> nested inside a do-not-align="true" element. '
                 "This is not allowed, please verify you XML input."
@@ -104,9 +104,20 @@ def add_ids(xml: etree) -> etree:
         xml (etree): xml to add ids to
 
     Returns:
-        etree: xml with ids added
+        etree: a deep copy of xml with ids added
+    """
+    return add_ids_in_place(deepcopy(xml))
+
+
+def add_ids_in_place(xml: etree) -> etree:
+    """Add ids to xml, modifying it in place
+
+    Args:
+        xml (etree): xml to add ids to
+
+    Returns:
+        etree: xml itself, with ids added
     """
-    xml = deepcopy(xml)
     ids: defaultdict = defaultdict(lambda: 0)
     for child in xml:  # don't bother with the root element
         if child.tag is etree.Comment:
@@ -35,9 +35,15 @@
 
 import copy
 import re
+from typing import Dict, Tuple
 
 from readalongs.log import LOGGER
-from readalongs.text.util import get_attrib_recursive, get_word_text, iterate_over_text
+from readalongs.text.util import (
+    compiled_xpath,
+    get_attrib_recursive,
+    get_word_text,
+    iterate_over_text,
+)
 from readalongs.util import get_langs
 
 
@@ -69,7 +75,7 @@ def convert_words(  # noqa: C901
     """
 
     if output_orthography != "eng-arpabet":
-        LOGGER.info(f"output_orthography={output_orthography}")
+        LOGGER.info("output_orthography=%s", output_orthography)
 
     # Defer expensive import of g2p to do them only if and when they are needed
     from g2p import InvalidLanguageCode, NoPath, make_g2p
@@ -80,6 +86,10 @@ def convert_words(  # noqa: C901
     g2p_fail_warning_count = 0
     g2p_empty_warning_count = 0
 
+    # Words repeat a lot in real text, so remember the results of convert_word()
+    # for each (word, lang) pair instead of running g2p on every occurrence.
+    g2p_cache: Dict[Tuple[str, str], tuple] = {}
+
     # Tuck this function inside convert_words(), to share common arguments and imports
     def convert_word(word: str, lang: str):
         """Convert one individual word through the specified cascade of g2p mappings.
@@ -97,6 +107,9 @@ def convert_words(  # noqa: C901
                 well as in the final output.
         """
 
+        if (word, lang) in g2p_cache and not verbose_warnings:
+            return g2p_cache[word, lang]
+
         try:
             converter = make_g2p(lang, output_orthography, tokenize=False)
         except InvalidLanguageCode as e:
@@ -121,10 +134,11 @@ def convert_words(  # noqa: C901
         valid = converter.check(tg, shallow=True) and text
         if not valid and verbose_warnings:
             converter.check(tg, shallow=False, display_warnings=verbose_warnings)
+        g2p_cache[word, lang] = text, valid
         return text, valid
 
     all_g2p_valid = True
-    for word in xml.xpath(".//" + word_unit):
+    for word in compiled_xpath(".//" + word_unit)(xml):
         # if the word was already g2p'd, skip and keep existing ARPABET representation
         if "ARPABET" in word.attrib:
             arpabet = word.attrib["ARPABET"]
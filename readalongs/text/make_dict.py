@@ -9,17 +9,10 @@
 #
 ##################################################
 
-from typing import List, Tuple
-
-import chevron
+from typing import Iterable, List, Tuple
 
 from readalongs.log import LOGGER
 
-DICT_TEMPLATE = """{{#items}}
-{{id}}\t{{pronunciation}}
-{{/items}}
-"""
-
 
 def generate_dict_entries(word_elements, input_filename, unit):
     nwords = 0
@@ -43,13 +36,10 @@ def make_dict_list(
     return list(generate_dict_entries(word_elements, input_filename, unit))
 
 
+def make_dict_text(dict_entries: Iterable[Tuple[str, str]]) -> str:
+    # Join all the entries at once rather than rendering them one by one
+    return "".join([f"{word_id}\t{text}\n" for word_id, text in dict_entries])
+
+
 def make_dict(word_elements, input_filename="'in-memory'", unit="m"):
-    data = {
-        "items": [
-            {"id": word_id, "pronunciation": text}
-            for word_id, text in generate_dict_entries(
-                word_elements, input_filename, unit
-            )
-        ]
-    }
-    return chevron.render(DICT_TEMPLATE, data)
+    return make_dict_text(generate_dict_entries(word_elements, input_filename, unit))
@@ -8,21 +8,17 @@ file for processing by PocketSphinx, SoundSwallower or SoundSwallower.js
 
 import datetime
 import os
+from typing import List, Tuple
 
-import chevron
 from slugify import slugify
 
 from readalongs.log import LOGGER
 
-FSG_TEMPLATE = """FSG_BEGIN {{name}}
-NUM_STATES {{num_states}}
+FSG_HEADER_TEMPLATE = """FSG_BEGIN {name}
+NUM_STATES {num_states}
 START_STATE 0
-FINAL_STATE {{final_state}}
+FINAL_STATE {final_state}
 
-{{#states}}
-TRANSITION {{current}} {{next}} 1.0 {{id}}
-{{/states}}
-FSG_END
 """
 
 
@@ -48,41 +44,62 @@ def get_ids(word_elements: list):
         yield e.attrib["id"]
 
 
-def make_fsg(word_elements: list, filename: str = "'in-memory'") -> str:
-    """Generate an FSG for the given words elements
+def make_fsg_name(filename: str) -> str:
+    """Return the name to give the FSG for the given input filename"""
+    # If name includes special characters, pocketsphinx throws a RuntimeError:
+    # new_Decoder returned -1, so pass it through slugify() first
+    return slugify(os.path.splitext(os.path.basename(filename))[0])
 
-    Returns: the text contents of the FSG file for processing by PocketSphinx
+
+def make_fsg_transitions(word_elements: list) -> List[Tuple[int, int, float, str]]:
+    """Generate the list of FSG transitions for the given words elements
+
+    Returns: a list of (from_state, to_state, probability, word) transitions,
+        suitable for soundswallower.Decoder.create_fsg()
     """
+    return [
+        (i, i + 1, 1.0, text_id) for i, text_id in enumerate(get_ids(word_elements))
+    ]
+
 
-    states = [
-        {"id": text_id, "current": i, "next": i + 1}
-        for i, text_id in enumerate(get_ids(word_elements))
+def make_fsg_text(
+    transitions: List[Tuple[int, int, float, str]], filename: str = "'in-memory'"
+) -> str:
+    """Generate the text of an FSG file from the output of make_fsg_transitions()"""
+    # Build the whole FSG as a list of lines joined once at the end: this is
+    # much faster than rendering a template with one section per transition.
+    header = FSG_HEADER_TEMPLATE.format(
+        name=make_fsg_name(filename),
+        final_state=len(transitions),
+        num_states=len(transitions) + 1,
+    )
+    lines = [
+        f"TRANSITION {from_state} {to_state} {prob} {word}\n"
+        for from_state, to_state, prob, word in transitions
     ]
+    return "".join([header, *lines, "FSG_END\n"])
 
-    data = {
-        # If name includes special characters, pocketsphinx throws a RuntimeError:
-        # new_Decoder returned -1, so pass it through slugify() first
-        "name": slugify(os.path.splitext(os.path.basename(filename))[0]),
-        "states": states,
-        "final_state": len(states),
-        "num_states": len(states) + 1,
-    }
 
-    return chevron.render(FSG_TEMPLATE, data)
+def make_fsg(word_elements: list, filename: str = "'in-memory'") -> str:
+    """Generate an FSG for the given words elements
+
+    Returns: the text contents of the FSG file for processing by PocketSphinx
+    """
+    return make_fsg_text(make_fsg_transitions(word_elements), filename)
 
 
 JSGF_TEMPLATE = """#JSGF 1.0 UTF-8;
-grammar {{name}};
+grammar {name};
 
 /**
-    * Auto-generated JSGF grammar for the document {{name}}.
+    * Auto-generated JSGF grammar for the document {name}.
     *
     * @author Automatically generated by make_jsgf
     * @version 1.0
-    * @since {{date}}
+    * @since {date}
     */
 
-public <s> = {{#words}} {{id}} {{/words}} ;
+public <s> = {words} ;
 """
 
 
@@ -94,10 +111,8 @@ def make_jsgf(word_elements: list, filename: str = "'in-memory'") -> str:
     Returns:
         the text contents of the JSGF file for processing by SoundSwallower.js
     """
-    data = {
-        "name": os.path.splitext(os.path.basename(filename))[0],
-        "date": datetime.datetime.today().strftime("%Y-%m-%d"),
-        "words": [{"id": text_id} for text_id in get_ids(word_elements)],
-    }
-
-    return chevron.render(JSGF_TEMPLATE, data)
+    return JSGF_TEMPLATE.format(
+        name=os.path.splitext(os.path.basename(filename))[0],
+        date=datetime.datetime.today().strftime("%Y-%m-%d"),
+        words="".join([f" {text_id} " for text_id in get_ids(word_elements)]),
+    )
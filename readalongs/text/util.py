@@ -14,7 +14,7 @@ import zipfile
 from collections import OrderedDict
 from datetime import datetime
 from io import TextIOWrapper
-from typing import IO, Union
+from typing import IO, Dict, Union
 
 from lxml import etree
 
@@ -33,6 +33,22 @@ def ensure_dirs(path):
         os.makedirs(dirname)
 
 
+# Compiled XPath expressions, see compiled_xpath()
+_compiled_xpaths: Dict[str, etree.XPath] = {}
+
+
+def compiled_xpath(expression: str) -> etree.XPath:
+    """Return expression compiled as an etree.XPath object
+
+    Calling element.xpath(expression) parses the expression again on each call,
+    so expressions evaluated over and over again are compiled only once here.
+    """
+    xpath = _compiled_xpaths.get(expression)
+    if xpath is None:
+        xpath = _compiled_xpaths[expression] = etree.XPath(expression)
+    return xpath
+
+
 def xpath_default(xml, query, default_namespace_prefix="i"):
     nsmap = xml.nsmap if hasattr(xml, "nsmap") else xml.getroot().nsmap
     nsmap = dict(
@@ -62,7 +78,7 @@ def get_attrib_recursive(element, *attribs):
         # We could also element.attrib[attrib] instead of xpath, but it only
         # works for attributes without a name, like attrib="lang", while xpath
         # also works for attributes with a namespace, like attrib="xml:lang".
-        path = element.xpath("./@" + attrib)
+        path = compiled_xpath("./@" + attrib)(element)
         if path:
             return path[0]
     if element.getparent() is not None:
@@ -148,7 +164,19 @@ def load_xml_zip(zip_path, input_path) -> etree.ElementTree:
 
 def write_xml(output_filelike, xml):
     """Write XML to already opened file-like object"""
-    output_filelike.write(etree.tostring(xml, encoding="utf-8", xml_declaration=True))
+    if hasattr(xml, "getroot"):
+        # Whole documents keep their DOCTYPE and top-level comments, which
+        # etree.xmlfile cannot write, so serialize those in one go.
+        output_filelike.write(
+            etree.tostring(xml, encoding="utf-8", xml_declaration=True)
+        )
+    else:
+        # Write the element straight to the file rather than returning it as
+        # a bytes object first. xf.write() still serializes the element in one
+        # go through libxml2's output buffer, so this is not true streaming.
+        with etree.xmlfile(output_filelike, encoding="utf-8") as xf:
+            xf.write_declaration()
+            xf.write(xml)
     output_filelike.write("\n".encode("utf-8"))
 
 
@@ -73,6 +73,18 @@ class SoundSwallowerDecoderStub:
     def __call__(self, *args):
         return self
 
+    def lookup_word(self, *args):
+        return None
+
+    def add_word(self, *args, **kwargs):
+        pass
+
+    def create_fsg(self, *args, **kwargs):
+        pass
+
+    def set_fsg(self, *args):
+        pass
+
     def start_utt(self):
         pass
 
@@ -100,6 +100,41 @@ class TestAnchors(BasicTestCase):
         self.assertIn("Align mode moderate failed for sequence 1.", logger_output)
         self.assertIn("Align mode loose succeeded for sequence 1.", logger_output)
 
+    def test_anchors_parallel(self):
+        """Aligning the sequences between anchors in parallel gives the same results"""
+        with redirect_stderr(StringIO()):
+            results = [
+                align_audio(
+                    os.path.join(self.data_dir, "ej-fra-anchors.readalong"),
+                    os.path.join(self.data_dir, "ej-fra.m4a"),
+                    jobs=jobs,
+                )
+                for jobs in (1, 2)
+            ]
+        self.assertEqual(len(results[0]["words"]), 99)
+        self.assertEqual(results[0]["words"], results[1]["words"])
+
+        # The workers still fall back on the looser align modes per sequence
+        xml_with_anchors = """<doc xml:lang="fra"><body>
+            <s>Bonjour.</s>
+            <anchor time="1.62s"/>
+            <s>Ceci ne peut pas être aligné avec du bruit.</s>
+            <anchor time="5.62s"/>
+            </body></doc>
+        """
+        xml_file = os.path.join(self.tempdir, "text-with-anchors-parallel.readalong")
+        with open(xml_file, "wt", encoding="utf8") as f:
+            print(xml_with_anchors, file=f)
+        with self.assertLogs(LOGGER, level="INFO") as cm:
+            with silence_c_stderr(), redirect_stderr(StringIO()):
+                results = align_audio(
+                    xml_file, os.path.join(self.data_dir, "noise.mp3"), jobs=2
+                )
+        self.assertEqual(len(results["words"]), 10)
+        logger_output = "\n".join(cm.output)
+        self.assertIn("Align mode strict succeeded for sequence 0.", logger_output)
+        self.assertIn("Align mode loose succeeded for sequence 1.", logger_output)
+
 
 if __name__ == "__main__":
     main()
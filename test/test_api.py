@@ -62,6 +62,31 @@ class TestAlignApi(BasicTestCase):
         self.assertNotEqual(status, 0)
         self.assertFalse(exception is None)
 
+    def test_call_align_g2p_cache(self):
+        textfile = self.tempdir / "fallback.txt"
+        with open(textfile, "w", encoding="utf8") as f:
+            print("Bonjour ça va", file=f)
+        fallback_warning = 'Could not g2p "ça" as English (eng). Trying fallback'
+        logs = []
+        for i, use_g2p_cache in enumerate((False, False, True, True)):
+            with SoundSwallowerStub("t0b0d0p0s0w0:920:1520"):
+                with redirect_stderr(StringIO()):
+                    (status, exception, log) = api.align(
+                        textfile,
+                        self.data_dir / "ej-fra.m4a",
+                        self.tempdir / f"output{i}",
+                        ("eng",),
+                        use_g2p_cache=use_g2p_cache,
+                    )
+            self.assertEqual(status, 0)
+            logs.append(log)
+        # Without the cache, which is the default, every call logs its g2p warnings
+        self.assertIn(fallback_warning, logs[0])
+        self.assertIn(fallback_warning, logs[1])
+        self.assertIn(fallback_warning, logs[2])
+        # A cache hit does not log them again
+        self.assertNotIn(fallback_warning, logs[3])
+
     def test_call_make_xml(self):
         with redirect_stderr(StringIO()):
             (status, exception, log) = api.make_xml(
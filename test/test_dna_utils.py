@@ -4,9 +4,13 @@
 
 from unittest import TestCase, main
 
+import numpy as np
+
 from readalongs.dna_utils import (
     calculate_adjustment,
+    calculate_adjustments,
     correct_adjustments,
+    correct_all_adjustments,
     dna_union,
     segment_intersection,
     sort_and_join_dna_segments,
@@ -109,6 +113,27 @@ class TestDNAUtils(TestCase):
             (1100, 1150),
         )
 
+    def test_vectorized_adjustments(self):
+        """The vectorized adjustment functions match the scalar ones"""
+        dna = segments_from_pairs((1000, 2000), (4000, 5000), (5500, 5500))
+        timestamps = np.array([0, 999, 1000, 2999, 3000, 4000, 4499, 4500, 9000])
+        self.assertEqual(
+            calculate_adjustments(timestamps, dna).tolist(),
+            [calculate_adjustment(t, dna) for t in timestamps.tolist()],
+        )
+
+        starts = np.array([500, 950, 975, 1100, 3900, 5400])
+        ends = np.array([900, 1125, 1150, 1200, 5100, 5600])
+        dna = segments_from_pairs((1000, 1100), (4000, 5000), (5500, 5510))
+        corrected_starts, corrected_ends = correct_all_adjustments(starts, ends, dna)
+        self.assertEqual(
+            list(zip(corrected_starts.tolist(), corrected_ends.tolist())),
+            [
+                correct_adjustments(start, end, dna)
+                for start, end in zip(starts.tolist(), ends.tolist())
+            ],
+        )
+
     def test_segment_intersection(self):
         """Unit testing of segment_intersection()"""
         self.assertEqual(segment_intersection([], []), [])
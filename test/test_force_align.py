@@ -16,7 +16,7 @@ from basic_test_case import BasicTestCase, silence_c_stderr
 from lxml import etree
 from soundswallower import get_model_path
 
-from readalongs.align import align_audio
+from readalongs.align import align_audio, read_noisedict
 from readalongs.align_utils import (
     convert_to_xhtml,
     create_input_ras,
@@ -160,6 +160,39 @@ class TestForceAlignment(BasicTestCase):
         for w, xw in zip(words, xml_words):
             self.assertEqual(xw.attrib["id"], w["id"])
 
+    def test_align_ids_in_model_dict(self):
+        """Word ids that are also words in the acoustic model's own dictionary
+        must still be aligned with their g2p pronunciation."""
+        xml_path = os.path.join(self.tempdir, "english-ids.readalong")
+        with open(xml_path, "w", encoding="utf8") as f:
+            f.write(
+                '<?xml version="1.0" encoding="utf-8"?><read-along version="1.2">'
+                '<text xml:lang="fra"><body><p><s><w id="hello">Bonjour</w>. '
+                '<w id="world">Je</w> m\'<w id="a">appelle</w> '
+                '<w id="the">Éric</w> <w id="is">Joanis</w>.</s></p></body></text>'
+                "</read-along>"
+            )
+        wav_path = os.path.join(self.data_dir, "ej-fra.m4a")
+        with redirect_stderr(StringIO()):
+            results = align_audio(
+                xml_path, wav_path, config={"acoustic_model": get_model_path("en-us")}
+            )
+        words = {w["id"]: w for w in results["words"]}
+        self.assertEqual(list(words), ["hello", "world", "a", "the", "is"])
+        self.assertLess(words["the"]["end"], 2.5)
+        self.assertLess(words["is"]["end"], 3.0)
+
+    def test_read_noisedict_changed(self):
+        """A noisedict file that changes on disk must not be served from the cache"""
+        noisedict_path = os.path.join(self.tempdir, "noisedict")
+        with open(noisedict_path, "w", encoding="utf8") as fh:
+            fh.write("<sil> SIL\n")
+        asr_config = {"fdict": noisedict_path, "hmm": str(self.tempdir)}
+        self.assertEqual(read_noisedict(asr_config), {"<sil>"})
+        with open(noisedict_path, "a", encoding="utf8") as fh:
+            fh.write("[BOGUS] SIL\n")
+        self.assertEqual(read_noisedict(asr_config), {"<sil>", "[BOGUS]"})
+
     def test_align_fail(self):
         """Alignment test case with bad audio that should fail."""
         xml_path = os.path.join(self.data_dir, "ej-fra.readalong")
@@ -2,6 +2,7 @@
 
 """Test suite for misc stuff that don't need their own stand-alone suite"""
 
+import io
 import itertools
 import os
 import zipfile
@@ -15,7 +16,9 @@ from test_dna_utils import segments_from_pairs
 
 from readalongs._version import READALONG_FILE_FORMAT_VERSION, VERSION
 from readalongs.align import split_silences
+from readalongs.align_utils import parse_and_make_xml
 from readalongs.log import LOGGER, capture_logs
+from readalongs.text.make_fsg import make_fsg
 from readalongs.text.util import (
     get_attrib_recursive,
     get_lang_attrib,
@@ -268,6 +271,15 @@ class TestMisc(BasicTestCase):
         loaded_xml = load_xml(filename)
         self.assertEqual(etree.tostring(loaded_xml), xml_text.encode(encoding="ascii"))
 
+        # Whole documents are saved with their DOCTYPE
+        doctype = '<!DOCTYPE foo SYSTEM "foo.dtd">'
+        save_xml(filename, etree.parse(io.BytesIO(f"{doctype}\n{xml_text}".encode())))
+        with open(filename, encoding="utf8") as f:
+            self.assertEqual(
+                f.read(),
+                f"<?xml version='1.0' encoding='utf-8'?>\n{doctype}\n{xml_text}\n",
+            )
+
     def test_save_txt(self):
         xml_text = '<foo attrib="value">text</foo>'
         filename = self.tempdir / "foo.txt"
@@ -303,6 +315,45 @@ class TestMisc(BasicTestCase):
         self.assertIn("included", "".join(cm.output))
         self.assertNotIn("propagate", "".join(cm.output))
 
+    def test_make_fsg(self):
+        xml = parse_xml(
+            '<s><w id="w1" ARPABET="HH AY">hi</w><w id="w2">?</w>'
+            '<w id="w3" ARPABET="Y UW">you</w></s>'
+        )
+        with self.assertLogs(LOGGER, level="WARNING"):
+            fsg = make_fsg(xml.xpath(".//w"), "path/to/My File.readalong")
+        self.assertEqual(
+            fsg,
+            "FSG_BEGIN my-file\n"
+            "NUM_STATES 3\n"
+            "START_STATE 0\n"
+            "FINAL_STATE 2\n"
+            "\n"
+            "TRANSITION 0 1 1.0 w1\n"
+            "TRANSITION 1 2 1.0 w3\n"
+            "FSG_END\n",
+        )
+
+    def test_parse_and_make_xml_cache(self):
+        xml_file = self.tempdir / "cached.readalong"
+        with open(xml_file, "w", encoding="utf8") as f:
+            f.write(
+                '<?xml version="1.0" encoding="utf-8"?><read-along version="1.2">'
+                '<text xml:lang="fra"><body><p><s>Bonjour le monde</s></p></body></text>'
+                "</read-along>"
+            )
+        xml1 = parse_and_make_xml(xml_file, {}, use_cache=True)
+        xml1_text = etree.tostring(xml1)
+        # Modifying the results must not affect what later calls get from the cache
+        xml1.clear()
+        xml2 = parse_and_make_xml(xml_file, {}, use_cache=True)
+        self.assertEqual(etree.tostring(xml2), xml1_text)
+        # A different output orthography must not reuse the cached results
+        xml3 = parse_and_make_xml(
+            xml_file, {}, output_orthography="eng-ipa", use_cache=True
+        )
+        self.assertNotEqual(etree.tostring(xml3), xml1_text)
+
     def test_version_is_pep440_compliant(self):
         self.assertTrue(is_canonical(VERSION))
 
@@ -8,6 +8,7 @@ from unittest import main
 from basic_test_case import BasicTestCase
 from pydub import AudioSegment
 
+from readalongs.align import splice_silences
 from readalongs.cli import align
 from readalongs.text.util import load_xml
 
@@ -81,6 +82,31 @@ class TestSilence(BasicTestCase):
         self.assertNotEqual(results.exit_code, 0)
         self.assertIn("Could not parse all duration attributes", results.output)
 
+    def test_splice_silences(self):
+        # 1s of constant non-zero audio, 8000 frames per second, 2 bytes per frame
+        audio = AudioSegment(
+            b"\x01\x00" * 8000,
+            metadata={
+                "channels": 1,
+                "sample_width": 2,
+                "frame_rate": 8000,
+                "frame_width": 2,
+            },
+        )
+        spliced = splice_silences(audio, [(0, 100), (250, 500), (2000, 10)])
+        self.assertEqual(spliced.frame_rate, 8000)
+        self.assertEqual(len(spliced), 1000 + 100 + 500 + 10)
+        self.assertEqual(
+            spliced.raw_data,
+            b"\x00\x00" * 800  # 100ms of silence at the start
+            + b"\x01\x00" * 2000  # the first 250ms of audio
+            + b"\x00\x00" * 4000  # 500ms of silence
+            + b"\x01\x00" * 6000  # the rest of the audio
+            + b"\x00\x00" * 80,  # silence past the end is added at the end
+        )
+        # No insertions: same audio
+        self.assertEqual(splice_silences(audio, []).raw_data, audio.raw_data)
+
 
 if __name__ == "__main__":
     main()